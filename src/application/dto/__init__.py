@@ -0,0 +1,21 @@
+from .stats import (
+    UserCounts,
+    DownloadCounts,
+    RequestCounts,
+    SystemStats,
+    UserRow,
+    Pagination,
+    PaginatedUsers,
+    OverviewStats
+)
+
+__all__ = [
+    'UserCounts',
+    'DownloadCounts',
+    'RequestCounts',
+    'SystemStats',
+    'UserRow',
+    'Pagination',
+    'PaginatedUsers',
+    'OverviewStats'
+]
\ No newline at end of file
@@ -0,0 +1,74 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True, slots=True)
+class UserCounts:
+    """User totals for system statistics"""
+    total: int
+    active: int
+    banned: int
+
+
+@dataclass(frozen=True, slots=True)
+class DownloadCounts:
+    """Download totals for system statistics"""
+    total: int
+    platform_breakdown: Dict[str, int]
+
+
+@dataclass(frozen=True, slots=True)
+class RequestCounts:
+    """Download request queue totals for system statistics"""
+    pending: int
+    processing: int
+
+
+@dataclass(frozen=True, slots=True)
+class SystemStats:
+    """System statistics for the admin dashboard"""
+    users: UserCounts
+    downloads: DownloadCounts
+    requests: RequestCounts
+    timestamp: str
+
+
+@dataclass(frozen=True, slots=True)
+class UserRow:
+    """Single row of the admin user list"""
+    id: int
+    username: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    language: str
+    download_count: int
+    is_banned: bool
+    created_at: Optional[str]
+    last_active: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class Pagination:
+    """Pagination details for a page of results"""
+    page: int
+    limit: int
+    total: int
+    pages: int
+
+
+@dataclass(frozen=True, slots=True)
+class PaginatedUsers:
+    """One page of the admin user list"""
+    users: List[UserRow]
+    pagination: Pagination
+
+
+@dataclass(frozen=True, slots=True)
+class OverviewStats:
+    """Overview statistics for analytics"""
+    total_downloads: int
+    total_users: int
+    active_users: int
+    platform_stats: Dict[str, int]
+    error_stats: Dict[str, int]
+    avg_processing_time: float
\ No newline at end of file
@@ -14,6 +14,15 @@ class DownloaderService(ABC):
         """Check if service can handle the given URL"""
         pass
     
+    def supports(self, url: str) -> Optional[bool]:
+        """
+        Synchronously decide whether service can handle the given URL
+        
+        Returns:
+            True or False when decidable without I/O, None if can_handle must be awaited
+        """
+        return None
+    
     @abstractmethod
     async def extract_media_info(self, url: str) -> Dict[str, Any]:
         """Extract media information from URL without downloading"""
@@ -55,4 +64,8 @@ class DownloaderService(ABC):
     @abstractmethod
     async def cleanup_temp_files(self, file_paths: List[str]) -> None:
         """Clean up temporary files"""
+        pass
+    
+    async def close(self) -> None:
+        """Release resources such as worker threads (no-op by default)"""
         pass
\ No newline at end of file
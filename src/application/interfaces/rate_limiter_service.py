@@ -1,8 +1,17 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 
 
+@dataclass
+class RateLimitResult:
+    """Outcome of an atomic rate limit check-and-consume"""
+    allowed: bool
+    remaining: int
+    reset_at: Optional[datetime] = None
+
+
 class RateLimiterService(ABC):
     """Abstract rate limiter service interface"""
     
@@ -11,6 +20,17 @@ class RateLimiterService(ABC):
         """Check if user is rate limited for specific action"""
         pass
     
+    @abstractmethod
+    async def check_and_consume(self, user_id: int, action: str = "download") -> RateLimitResult:
+        """
+        Atomically check the rate limit and consume one request if allowed
+        
+        Returns:
+            RateLimitResult with whether the request is allowed, the
+            remaining requests in the window and when the window resets
+        """
+        pass
+    
     @abstractmethod
     async def get_rate_limit_info(self, user_id: int, action: str = "download") -> Dict[str, Any]:
         """
@@ -69,4 +89,8 @@ class RateLimiterService(ABC):
     @abstractmethod
     async def cleanup_expired_limits(self) -> int:
         """Clean up expired rate limit entries"""
+        pass
+    
+    async def close(self) -> None:
+        """Persist pending writes and release resources (no-op by default)"""
         pass
\ No newline at end of file
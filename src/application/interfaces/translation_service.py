@@ -26,22 +26,22 @@ class TranslationService(ABC):
         pass
     
     @abstractmethod
-    async def get_supported_languages(self) -> List[str]:
+    def get_supported_languages(self) -> List[str]:
         """Get list of supported language codes"""
         pass
     
     @abstractmethod
-    async def is_language_supported(self, language: str) -> bool:
+    def is_language_supported(self, language: str) -> bool:
         """Check if language is supported"""
         pass
     
     @abstractmethod
-    async def get_language_name(self, language_code: str, in_language: str = "en") -> str:
+    def get_language_name(self, language_code: str, in_language: str = "en") -> str:
         """Get language name in specified language"""
         pass
     
     @abstractmethod
-    async def detect_language_from_text(self, text: str) -> Optional[str]:
+    def detect_language_from_text(self, text: str) -> Optional[str]:
         """Detect language from text (if supported)"""
         pass
     
@@ -68,4 +68,8 @@ class TranslationService(ABC):
     @abstractmethod
     async def get_missing_translations(self, reference_language: str = "en") -> Dict[str, List[str]]:
         """Get missing translations for each language compared to reference"""
+        pass
+    
+    async def close(self) -> None:
+        """Persist pending writes and release resources (no-op by default)"""
         pass
\ No newline at end of file
@@ -1,3 +1,4 @@
+import asyncio
 from typing import List, Dict, Optional
 from datetime import datetime
 
@@ -8,6 +9,16 @@ from ...domain.repositories.download_request_repository import DownloadRequestRe
 from ..interfaces.notification_service import NotificationService
 from ..interfaces.translation_service import TranslationService
 from ..interfaces.rate_limiter_service import RateLimiterService
+from ..dto.stats import (
+    UserCounts,
+    DownloadCounts,
+    RequestCounts,
+    SystemStats,
+    UserRow,
+    Pagination,
+    PaginatedUsers
+)
+from ...shared.config.constants import Constants
 
 
 class AdminUseCase:
@@ -29,105 +40,105 @@ class AdminUseCase:
         self.translation_service = translation_service
         self.rate_limiter_service = rate_limiter_service
     
-    async def get_system_stats(self) -> Dict:
+    async def get_system_stats(self) -> SystemStats:
         """Get system statistics"""
-        all_users = await self.user_repository.get_all()
-        active_users = await self.user_repository.get_active_users(days=30)
-        banned_users = await self.user_repository.get_banned_users()
-        
-        total_downloads = await self.analytics_repository.get_total_downloads()
-        platform_stats = await self.analytics_repository.get_platform_stats()
-        
-        pending_requests = await self.download_request_repository.get_pending_requests()
-        processing_requests = await self.download_request_repository.get_processing_requests()
+        platforms = Constants.SUPPORTED_PLATFORMS
+        (
+            total_users,
+            active_users,
+            banned_users,
+            total_downloads,
+            pending_requests,
+            processing_requests,
+            *per_platform
+        ) = await asyncio.gather(
+            self.user_repository.count_total_users(),
+            self.user_repository.count_active_users(days=30),
+            self.user_repository.count_banned_users(),
+            self.analytics_repository.get_total_downloads(),
+            self.download_request_repository.count_pending_requests(),
+            self.download_request_repository.count_processing_requests(),
+            # All time, like the download total above
+            *(self.analytics_repository.get_platform_stats(platform, days=None) for platform in platforms)
+        )
         
-        return {
-            "users": {
-                "total": len(all_users),
-                "active": len(active_users),
-                "banned": len(banned_users)
-            },
-            "downloads": {
-                "total": total_downloads,
-                "platform_breakdown": platform_stats
-            },
-            "requests": {
-                "pending": len(pending_requests),
-                "processing": len(processing_requests)
-            },
-            "timestamp": datetime.now().isoformat()
-        }
+        return SystemStats(
+            users=UserCounts(
+                total=total_users,
+                active=active_users,
+                banned=banned_users
+            ),
+            downloads=DownloadCounts(
+                total=total_downloads,
+                platform_breakdown={
+                    platform: stats["total_downloads"]
+                    for platform, stats in zip(platforms, per_platform)
+                }
+            ),
+            requests=RequestCounts(
+                pending=pending_requests,
+                processing=processing_requests
+            ),
+            timestamp=datetime.now().isoformat()
+        )
     
-    async def get_user_list(self, page: int = 1, limit: int = 50) -> Dict:
+    async def get_user_list(self, page: int = 1, limit: int = 50) -> PaginatedUsers:
         """Get paginated user list"""
-        all_users = await self.user_repository.get_all()
-        
-        # Simple pagination
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        paginated_users = all_users[start_idx:end_idx]
+        paginated_users, total_users = await asyncio.gather(
+            self.user_repository.get_paginated((page - 1) * limit, limit),
+            self.user_repository.count_total_users()
+        )
         
-        user_data = []
-        for user in paginated_users:
-            user_data.append({
-                "id": user.id,
-                "username": user.username,
-                "first_name": user.first_name,
-                "last_name": user.last_name,
-                "language": user.language,
-                "download_count": user.download_count,
-                "is_banned": user.is_banned,
-                "created_at": user.created_at.isoformat() if user.created_at else None,
-                "last_active": user.last_active.isoformat() if user.last_active else None
-            })
+        user_rows = [
+            UserRow(
+                id=user.id,
+                username=user.username,
+                first_name=user.first_name,
+                last_name=user.last_name,
+                language=user.language,
+                download_count=user.download_count,
+                is_banned=user.is_banned,
+                created_at=user.created_at_iso,
+                last_active=user.last_active_iso
+            )
+            for user in paginated_users
+        ]
         
-        return {
-            "users": user_data,
-            "pagination": {
-                "page": page,
-                "limit": limit,
-                "total": len(all_users),
-                "pages": (len(all_users) + limit - 1) // limit
-            }
-        }
+        return PaginatedUsers(
+            users=user_rows,
+            pagination=Pagination(
+                page=page,
+                limit=limit,
+                total=total_users,
+                pages=(total_users + limit - 1) // limit
+            )
+        )
     
     async def broadcast_message(self, message: str, target_language: Optional[str] = None) -> Dict:
         """Broadcast message to users"""
-        if target_language:
-            users = await self.user_repository.get_users_by_language(target_language)
-        else:
-            users = await self.user_repository.get_all()
+        recipient_ids = await self.user_repository.get_broadcast_recipients(target_language)
         
-        # Filter out banned users
-        active_users = [user for user in users if not user.is_banned]
-        
-        sent_count = await self.notification_service.broadcast_message(active_users, message)
+        # The notification service sends in paced batches that respect Telegram's rate limits
+        results = await self.notification_service.broadcast_message(recipient_ids, message)
         
         return {
             "message": message,
             "target_language": target_language,
-            "total_users": len(active_users),
-            "sent_count": sent_count
+            "total_users": len(recipient_ids),
+            "sent_count": sum(1 for sent in results.values() if sent)
         }
     
     async def manage_user_ban(self, user_id: int, banned: bool, admin_id: int) -> User:
         """Ban or unban a user"""
-        user = await self.user_repository.get_by_id(user_id)
+        user = await self.user_repository.set_banned(user_id, banned)
         if not user:
             raise ValueError("User not found")
         
-        if banned:
-            user.ban_user()
-            message_key = "user_banned"
-        else:
-            user.unban_user()
-            message_key = "user_unbanned"
-        
-        user = await self.user_repository.update(user)
+        message_key = "user_banned" if banned else "user_unbanned"
         
-        # Send notification to user
-        notification_message = await self.translation_service.get_translation(
-            user.language, message_key
+        # Send notification to user (served from preloaded tables, no I/O)
+        notification_message = await self.translation_service.get_text(
+            message_key, user.language
         )
         await self.notification_service.send_message(user_id, notification_message)
         
@@ -139,9 +150,12 @@ class AdminUseCase:
     
     async def cleanup_system(self) -> Dict:
         """Clean up old data"""
-        analytics_cleaned = await self.analytics_repository.cleanup_old_records(days=90)
-        requests_cleaned = await self.download_request_repository.cleanup_old_requests(days=30)
-        limits_cleaned = await self.rate_limiter_service.cleanup_expired_limits()
+        # Each cleanup touches a separate store, so run them concurrently
+        analytics_cleaned, requests_cleaned, limits_cleaned = await asyncio.gather(
+            self.analytics_repository.cleanup_old_records(days=90),
+            self.download_request_repository.delete_old_requests(days=30),
+            self.rate_limiter_service.cleanup_expired_limits()
+        )
         
         return {
             "analytics_records_cleaned": analytics_cleaned,
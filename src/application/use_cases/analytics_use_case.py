@@ -1,9 +1,12 @@
+import asyncio
 from typing import Dict, List
 from datetime import datetime, timedelta
 
 from ...domain.entities.analytics import Analytics
 from ...domain.repositories.analytics_repository import AnalyticsRepository
 from ...domain.repositories.user_repository import UserRepository
+from ...shared.config.constants import Constants
+from ..dto.stats import OverviewStats
 
 
 class AnalyticsUseCase:
@@ -17,25 +20,39 @@ class AnalyticsUseCase:
         self.analytics_repository = analytics_repository
         self.user_repository = user_repository
     
-    async def get_overview_stats(self) -> Dict:
+    async def get_overview_stats(self) -> OverviewStats:
         """Get overview statistics"""
-        total_downloads = await self.analytics_repository.get_total_downloads()
-        platform_stats = await self.analytics_repository.get_platform_stats()
-        error_stats = await self.analytics_repository.get_error_stats()
-        avg_processing_time = await self.analytics_repository.get_average_processing_time()
+        platforms = Constants.SUPPORTED_PLATFORMS
+        (
+            error_summary,
+            total_users,
+            active_users,
+            *per_platform
+        ) = await asyncio.gather(
+            self.analytics_repository.get_error_summary(),
+            self.user_repository.count_total_users(),
+            self.user_repository.count_active_users(days=30),
+            # All time, like the totals and errors above
+            *(self.analytics_repository.get_platform_stats(platform, days=None) for platform in platforms)
+        )
         
-        # Get user statistics
-        all_users = await self.user_repository.get_all()
-        active_users = await self.user_repository.get_active_users(days=30)
+        # Weight each platform's average by the downloads it was computed from
+        timed_downloads = sum(stats["timed_downloads"] for stats in per_platform)
+        avg_processing_time = sum(
+            stats["average_processing_time"] * stats["timed_downloads"] for stats in per_platform
+        ) / timed_downloads if timed_downloads else 0.0
         
-        return {
-            "total_downloads": total_downloads,
-            "total_users": len(all_users),
-            "active_users": len(active_users),
-            "platform_stats": platform_stats,
-            "error_stats": error_stats,
-            "avg_processing_time": avg_processing_time
-        }
+        return OverviewStats(
+            total_downloads=error_summary["total_downloads"],
+            total_users=total_users,
+            active_users=active_users,
+            platform_stats={
+                platform: stats["total_downloads"]
+                for platform, stats in zip(platforms, per_platform)
+            },
+            error_stats=error_summary["errors"],
+            avg_processing_time=avg_processing_time
+        )
     
     async def get_daily_stats(self, days: int = 30) -> Dict[str, int]:
         """Get daily statistics"""
@@ -50,48 +67,48 @@ class AnalyticsUseCase:
                 "username": user.username,
                 "first_name": user.first_name,
                 "download_count": user.download_count,
-                "last_active": user.last_active.isoformat() if user.last_active else None
+                "last_active": user.last_active_iso
             }
             for user in users
         ]
     
     async def get_platform_breakdown(self) -> Dict[str, int]:
         """Get platform usage breakdown"""
-        return await self.analytics_repository.get_platform_stats()
+        platforms = Constants.SUPPORTED_PLATFORMS
+        per_platform = await asyncio.gather(
+            *(self.analytics_repository.get_platform_stats(platform, days=None) for platform in platforms)
+        )
+        return {platform: stats["total_downloads"] for platform, stats in zip(platforms, per_platform)}
     
     async def get_error_analysis(self) -> Dict:
         """Get error analysis"""
-        error_stats = await self.analytics_repository.get_error_stats()
-        total_downloads = await self.analytics_repository.get_total_downloads()
+        summary = await self.analytics_repository.get_error_summary()
+        error_stats = summary["errors"]
+        total_downloads = summary["total_downloads"]
+        total_errors = sum(error_stats.values())
         
         success_rate = 0
         if total_downloads > 0:
-            failed_downloads = sum(error_stats.values())
-            success_rate = ((total_downloads - failed_downloads) / total_downloads) * 100
+            success_rate = ((total_downloads - total_errors) / total_downloads) * 100
         
         return {
             "error_breakdown": error_stats,
             "success_rate": success_rate,
-            "total_errors": sum(error_stats.values())
+            "total_errors": total_errors
         }
     
     async def get_user_activity_stats(self, days: int = 30) -> Dict:
         """Get user activity statistics"""
-        active_users = await self.user_repository.get_active_users(days)
-        all_users = await self.user_repository.get_all()
-        
-        # Group by language
-        language_stats = {}
-        for user in all_users:
-            language = user.language
-            if language not in language_stats:
-                language_stats[language] = 0
-            language_stats[language] += 1
+        language_stats, total_users, active_users = await asyncio.gather(
+            self.user_repository.get_language_breakdown(),
+            self.user_repository.count_total_users(),
+            self.user_repository.count_active_users(days)
+        )
         
         return {
-            "active_users": len(active_users),
-            "total_users": len(all_users),
-            "activity_rate": (len(active_users) / len(all_users)) * 100 if all_users else 0,
+            "active_users": active_users,
+            "total_users": total_users,
+            "activity_rate": (active_users / total_users) * 100 if total_users else 0,
             "language_breakdown": language_stats
         }
     
@@ -1,10 +1,13 @@
-import uuid
-from typing import List, Optional
+import asyncio
+import time
 from datetime import datetime
+from secrets import token_hex
+from typing import List, Optional
 
 from ...domain.entities.download_request import DownloadRequest, DownloadStatus
 from ...domain.entities.media import Media
-from ...domain.entities.analytics import Analytics
+from ...domain.entities.user import User
+from ...domain.entities.analytics import Analytics, AnalyticsEventType
 from ...domain.repositories.download_request_repository import DownloadRequestRepository
 from ...domain.repositories.user_repository import UserRepository
 from ...domain.repositories.analytics_repository import AnalyticsRepository
@@ -35,35 +38,46 @@ class DownloadMediaUseCase:
         self.rate_limiter_service = rate_limiter_service
         self.translation_service = translation_service
     
+    async def _reject_rate_limited(self, user: User, reset_at: Optional[datetime]) -> None:
+        """Tell the user they hit the download limit and abort the request"""
+        message = await self.translation_service.get_text(
+            "rate_limit_exceeded", user.language, reset_time=reset_at
+        )
+        await self.notification_service.send_error_message(user.id, message)
+        raise ValueError("Rate limit exceeded")
+    
     async def execute(self, user_id: int, url: str, platform: str) -> DownloadRequest:
         """Execute media download"""
-        start_time = datetime.now()
+        start_time = time.monotonic()
         
-        # Check if user exists
-        user = await self.user_repository.get_by_id(user_id)
+        # Cheap in-memory gates first, so unknown and rate-limited users never reach the platform
+        user, rate_limited = await asyncio.gather(
+            self.user_repository.get_by_id(user_id),
+            self.rate_limiter_service.is_rate_limited(user_id, "download")
+        )
         if not user:
             raise ValueError("User not found")
         
-        # Check rate limits
-        if await self.rate_limiter_service.is_rate_limited(user_id, "download"):
-            reset_time = await self.rate_limiter_service.get_reset_time(user_id, "download")
-            message = await self.translation_service.get_translation(
-                user.language, "rate_limit_exceeded", reset_time=reset_time
-            )
-            await self.notification_service.send_error_message(user_id, message)
-            raise ValueError("Rate limit exceeded")
+        if rate_limited:
+            time_until_reset = await self.rate_limiter_service.get_time_until_reset(user_id, "download")
+            reset_at = datetime.now() + time_until_reset if time_until_reset is not None else None
+            await self._reject_rate_limited(user, reset_at)
         
         # Validate URL
-        if not await self.downloader_service.validate_url(url, platform):
-            message = await self.translation_service.get_translation(
-                user.language, "invalid_url"
+        if not await self.downloader_service.validate_url(url):
+            message = await self.translation_service.get_text(
+                "invalid_url", user.language
             )
             await self.notification_service.send_error_message(user_id, message)
             raise ValueError("Invalid URL")
         
+        # Spend quota only for a valid URL; atomic, so concurrent requests cannot both pass the check above
+        rate_limit = await self.rate_limiter_service.check_and_consume(user_id, "download")
+        if not rate_limit.allowed:
+            await self._reject_rate_limited(user, rate_limit.reset_at)
+        
         # Create download request
         request = DownloadRequest(
-            id=str(uuid.uuid4()),
             user_id=user_id,
             url=url,
             platform=platform
@@ -77,8 +91,8 @@ class DownloadMediaUseCase:
             await self.download_request_repository.update(request)
             
             # Send progress message
-            progress_message = await self.translation_service.get_translation(
-                user.language, "download_starting"
+            progress_message = await self.translation_service.get_text(
+                "download_starting", user.language
             )
             await self.notification_service.send_progress_message(user_id, progress_message)
             
@@ -104,20 +118,18 @@ class DownloadMediaUseCase:
             user.increment_downloads()
             await self.user_repository.update(user)
             
-            # Increment rate limit usage
-            await self.rate_limiter_service.increment_usage(user_id, "download")
-            
             # Record analytics
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.monotonic() - start_time
             analytics = Analytics(
-                id=str(uuid.uuid4()),
+                id=token_hex(16),
                 user_id=user_id,
-                action="download",
+                event_type=AnalyticsEventType.DOWNLOAD_SUCCESS,
                 platform=platform,
                 success=True,
                 processing_time=processing_time
             )
-            await self.analytics_repository.create(analytics)
+            # Queued and written in batches in the background
+            await self.analytics_repository.save(analytics)
             
         except Exception as e:
             # Mark as failed
@@ -125,23 +137,23 @@ class DownloadMediaUseCase:
             await self.download_request_repository.update(request)
             
             # Send error message
-            error_message = await self.translation_service.get_translation(
-                user.language, "download_failed", error=str(e)
+            error_message = await self.translation_service.get_text(
+                "download_failed", user.language, error=str(e)
             )
             await self.notification_service.send_error_message(user_id, error_message)
             
             # Record analytics
-            processing_time = (datetime.now() - start_time).total_seconds()
+            processing_time = time.monotonic() - start_time
             analytics = Analytics(
-                id=str(uuid.uuid4()),
+                id=token_hex(16),
                 user_id=user_id,
-                action="download",
+                event_type=AnalyticsEventType.DOWNLOAD_FAILED,
                 platform=platform,
                 success=False,
                 error_message=str(e),
                 processing_time=processing_time
             )
-            await self.analytics_repository.create(analytics)
+            await self.analytics_repository.save(analytics)
             
             raise
         
@@ -1,4 +1,6 @@
-from typing import Optional
+import asyncio
+import logging
+from typing import Optional, Set
 from datetime import datetime
 
 from ...domain.entities.user import User
@@ -6,6 +8,8 @@ from ...domain.repositories.user_repository import UserRepository
 from ..interfaces.notification_service import NotificationService
 from ..interfaces.translation_service import TranslationService
 
+logger = logging.getLogger(__name__)
+
 
 class ManageUserUseCase:
     """Use case for managing users"""
@@ -19,6 +23,7 @@ class ManageUserUseCase:
         self.user_repository = user_repository
         self.notification_service: Optional[NotificationService] = notification_service
         self.translation_service = translation_service
+        self._pending_tasks: Set[asyncio.Task] = set()
     
     async def register_user(
         self, 
@@ -29,35 +34,39 @@ class ManageUserUseCase:
         language: str = "en"
     ) -> User:
         """Register a new user"""
-        # Check if user already exists
-        existing_user = await self.user_repository.get_by_id(user_id)
-        if existing_user:
-            # Update existing user info
-            existing_user.username = username
-            existing_user.first_name = first_name
-            existing_user.last_name = last_name
-            existing_user.update_activity()
-            return await self.user_repository.update(existing_user)
-        
-        # Create new user
-        user = User(
+        user, created = await self.user_repository.upsert(User(
             id=user_id,
             username=username,
             first_name=first_name,
             last_name=last_name,
             language=language
-        )
+        ))
+        if not created:
+            return user
         
-        user = await self.user_repository.create(user)
-        
-        # Send welcome message
-        welcome_message = await self.translation_service.get_translation(
-            language, "welcome_message", name=first_name or username or "User"
-        )
-        await self.notification_service.send_message(user_id, welcome_message)
+        # Welcome delivery is best-effort, so don't hold the handler on the Telegram round-trip
+        task = asyncio.create_task(self._send_welcome(user_id, language, first_name, username))
+        self._pending_tasks.add(task)
+        task.add_done_callback(self._pending_tasks.discard)
         
         return user
     
+    async def _send_welcome(
+        self,
+        user_id: int,
+        language: str,
+        first_name: Optional[str],
+        username: Optional[str]
+    ) -> None:
+        """Send welcome message to a new user, logging instead of raising on failure"""
+        try:
+            welcome_message = await self.translation_service.get_text(
+                "welcome_message", language, name=first_name or username or "User"
+            )
+            await self.notification_service.send_message(user_id, welcome_message)
+        except Exception as e:
+            logger.error(f"Failed to send welcome message to user {user_id}: {e}")
+    
     async def get_user(self, user_id: int) -> Optional[User]:
         """Get user by ID"""
         return await self.user_repository.get_by_id(user_id)
@@ -69,11 +78,11 @@ class ManageUserUseCase:
             raise ValueError("User not found")
         
         user.change_language(language)
-        user = await self.user_repository.update(user)
         
-        # Send confirmation message
-        confirmation_message = await self.translation_service.get_translation(
-            language, "language_changed"
+        # Confirmation text does not depend on the write, so look it up alongside it
+        user, confirmation_message = await asyncio.gather(
+            self.user_repository.save(user),
+            self.translation_service.get_text("language_changed", language)
         )
         await self.notification_service.send_message(user_id, confirmation_message)
         
@@ -81,34 +90,24 @@ class ManageUserUseCase:
     
     async def ban_user(self, user_id: int, admin_id: int) -> User:
         """Ban a user"""
-        user = await self.user_repository.get_by_id(user_id)
+        user = await self.user_repository.set_banned(user_id, True)
         if not user:
             raise ValueError("User not found")
         
-        user.ban_user()
-        user = await self.user_repository.update(user)
-        
         # Send ban notification
-        ban_message = await self.translation_service.get_translation(
-            user.language, "user_banned"
-        )
+        ban_message = await self.translation_service.get_text("user_banned", user.language)
         await self.notification_service.send_message(user_id, ban_message)
         
         return user
     
     async def unban_user(self, user_id: int, admin_id: int) -> User:
         """Unban a user"""
-        user = await self.user_repository.get_by_id(user_id)
+        user = await self.user_repository.set_banned(user_id, False)
         if not user:
             raise ValueError("User not found")
         
-        user.unban_user()
-        user = await self.user_repository.update(user)
-        
         # Send unban notification
-        unban_message = await self.translation_service.get_translation(
-            user.language, "user_unbanned"
-        )
+        unban_message = await self.translation_service.get_text("user_unbanned", user.language)
         await self.notification_service.send_message(user_id, unban_message)
         
         return user
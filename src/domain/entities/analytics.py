@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from typing import Dict, Optional, Any
 from datetime import datetime
 from enum import Enum
+import time
 
 
 class AnalyticsEventType(Enum):
@@ -15,7 +16,17 @@ class AnalyticsEventType(Enum):
     ERROR_OCCURRED = "error_occurred"
 
 
-@dataclass
+_DOWNLOAD_EVENTS = frozenset({
+    AnalyticsEventType.DOWNLOAD_START,
+    AnalyticsEventType.DOWNLOAD_SUCCESS,
+    AnalyticsEventType.DOWNLOAD_FAILED
+})
+
+# Plain dict lookup for serialization, avoiding the Enum value descriptor
+_EVENT_TYPE_NAME: Dict[AnalyticsEventType, str] = {event_type: event_type.value for event_type in AnalyticsEventType}
+
+
+@dataclass(slots=True)
 class Analytics:
     """Analytics domain entity for tracking user behavior and system performance"""
     id: str
@@ -34,8 +45,6 @@ class Analytics:
     def __post_init__(self):
         if self.created_at is None:
             self.created_at = datetime.now()
-        if self.metadata is None:
-            self.metadata = {}
     
     def add_metadata(self, key: str, value: Any):
         """Add metadata to the analytics record"""
@@ -48,14 +57,14 @@ class Analytics:
         self.success = False
         self.error_message = error_message
     
-    def set_processing_time(self, start_time: datetime):
-        """Set processing time based on start time"""
-        self.processing_time = (datetime.now() - start_time).total_seconds()
+    def set_processing_time(self, start_time: float):
+        """Set processing time based on start time taken from time.monotonic()"""
+        self.processing_time = time.monotonic() - start_time
     
     def is_download_event(self) -> bool:
         """Check if this is a download-related event"""
-        return self.event_type in [
-            AnalyticsEventType.DOWNLOAD_START,
-            AnalyticsEventType.DOWNLOAD_SUCCESS,
-            AnalyticsEventType.DOWNLOAD_FAILED
-        ]
\ No newline at end of file
+        return self.event_type in _DOWNLOAD_EVENTS
+    
+    def get_event_type_name(self) -> str:
+        """Get event type name as string"""
+        return _EVENT_TYPE_NAME[self.event_type]
\ No newline at end of file
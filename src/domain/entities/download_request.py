@@ -2,7 +2,9 @@ from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
-import uuid
+import re
+import time
+from secrets import token_hex
 
 from .media import Media
 
@@ -22,10 +24,23 @@ class Platform(Enum):
     TIKTOK = "tiktok"
 
 
-@dataclass
+# Single pass over the URL to detect its platform (vm.tiktok.com matches tiktok.com)
+_PLATFORM_RE = re.compile(r"instagram\.com|instagr\.am|tiktok\.com")
+_PLATFORM_BY_DOMAIN = {
+    "instagram.com": Platform.INSTAGRAM,
+    "instagr.am": Platform.INSTAGRAM,
+    "tiktok.com": Platform.TIKTOK
+}
+
+# Plain dict lookups for serialization paths, avoiding the Enum value descriptor
+_PLATFORM_NAME: Dict[Optional[Platform], str] = {None: "unknown", **{platform: platform.value for platform in Platform}}
+_STATUS_NAME: Dict[DownloadStatus, str] = {status: status.value for status in DownloadStatus}
+
+
+@dataclass(slots=True)
 class DownloadRequest:
     """Download request domain entity"""
-    id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = field(default_factory=lambda: token_hex(16))
     user_id: int = 0
     url: str = ""
     platform: Optional[Platform] = None
@@ -36,10 +51,13 @@ class DownloadRequest:
     error_message: Optional[str] = None
     retry_count: int = 0
     max_retries: int = 3
-    media_files: List[str] = field(default_factory=list)
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    # Left as None until used to avoid allocating an empty container per request
+    media_files: Optional[List[str]] = None
+    metadata: Optional[Dict[str, Any]] = None
     total_size: Optional[int] = None
     processing_time: Optional[float] = None
+    # Monotonic start for measuring processing time without datetime arithmetic
+    _started_monotonic: Optional[float] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.created_at is None:
@@ -47,43 +65,46 @@ class DownloadRequest:
         
         # Determine platform from URL if not set
         if self.platform is None and self.url:
-            if "instagram.com" in self.url or "instagr.am" in self.url:
-                self.platform = Platform.INSTAGRAM
-            elif "tiktok.com" in self.url or "vm.tiktok.com" in self.url:
-                self.platform = Platform.TIKTOK
+            match = _PLATFORM_RE.search(self.url)
+            if match:
+                self.platform = _PLATFORM_BY_DOMAIN[match.group()]
     
     def start_processing(self):
         """Mark request as started processing"""
         self.status = DownloadStatus.PROCESSING
         self.started_at = datetime.now()
+        self._started_monotonic = time.monotonic()
+    
+    def _finish(self):
+        """Set completion time and processing time"""
+        self.completed_at = datetime.now()
+        if self._started_monotonic is not None:
+            self.processing_time = time.monotonic() - self._started_monotonic
+        elif self.started_at:
+            # Started before being loaded from storage, only wall-clock time is known
+            self.processing_time = (self.completed_at - self.started_at).total_seconds()
     
     def complete_successfully(self, media_files: List[str], total_size: Optional[int] = None):
         """Mark request as completed successfully"""
         self.status = DownloadStatus.COMPLETED
-        self.completed_at = datetime.now()
         self.media_files = media_files
         self.total_size = total_size
-        if self.started_at:
-            self.processing_time = (self.completed_at - self.started_at).total_seconds()
+        self._finish()
     
     def fail(self, error_message: str):
         """Mark request as failed"""
         self.status = DownloadStatus.FAILED
-        self.completed_at = datetime.now()
         self.error_message = error_message
-        if self.started_at:
-            self.processing_time = (self.completed_at - self.started_at).total_seconds()
+        self._finish()
     
     def cancel(self):
         """Cancel the request"""
         self.status = DownloadStatus.CANCELLED
-        self.completed_at = datetime.now()
-        if self.started_at:
-            self.processing_time = (self.completed_at - self.started_at).total_seconds()
+        self._finish()
     
     def can_retry(self) -> bool:
         """Check if request can be retried"""
-        return self.retry_count < self.max_retries and self.status == DownloadStatus.FAILED
+        return self.status is DownloadStatus.FAILED and self.retry_count < self.max_retries
     
     def increment_retry(self):
         """Increment retry count and reset to pending"""
@@ -93,19 +114,26 @@ class DownloadRequest:
             self.error_message = None
             self.started_at = None
             self.completed_at = None
+            self._started_monotonic = None
     
     def add_metadata(self, key: str, value: Any):
         """Add metadata to the request"""
+        if self.metadata is None:
+            self.metadata = {}
         self.metadata[key] = value
     
     def get_platform_name(self) -> str:
         """Get platform name as string"""
-        return self.platform.value if self.platform else "unknown"
+        return _PLATFORM_NAME[self.platform]
+    
+    def get_status_name(self) -> str:
+        """Get status name as string"""
+        return _STATUS_NAME[self.status]
     
     def is_instagram(self) -> bool:
         """Check if this is an Instagram request"""
-        return self.platform == Platform.INSTAGRAM
+        return self.platform is Platform.INSTAGRAM
     
     def is_tiktok(self) -> bool:
         """Check if this is a TikTok request"""
-        return self.platform == Platform.TIKTOK
\ No newline at end of file
+        return self.platform is Platform.TIKTOK
\ No newline at end of file
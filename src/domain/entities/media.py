@@ -14,7 +14,11 @@ class MediaType(Enum):
     TIKTOK_VIDEO = "tiktok_video"
 
 
-@dataclass
+_VIDEO_TYPES = frozenset({MediaType.VIDEO, MediaType.REEL, MediaType.TIKTOK_VIDEO})
+_STORY_TYPES = frozenset({MediaType.STORY, MediaType.HIGHLIGHT})
+
+
+@dataclass(slots=True)
 class Media:
     """Media domain entity"""
     id: str
@@ -35,7 +39,7 @@ class Media:
     
     def is_video(self) -> bool:
         """Check if media is a video type"""
-        return self.media_type in [MediaType.VIDEO, MediaType.REEL, MediaType.TIKTOK_VIDEO]
+        return self.media_type in _VIDEO_TYPES
     
     def is_image(self) -> bool:
         """Check if media is an image type"""
@@ -43,7 +47,7 @@ class Media:
     
     def is_story_content(self) -> bool:
         """Check if media is story content"""
-        return self.media_type in [MediaType.STORY, MediaType.HIGHLIGHT]
+        return self.media_type in _STORY_TYPES
     
     def get_file_extension(self) -> str:
         """Get appropriate file extension based on media type"""
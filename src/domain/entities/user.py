@@ -1,9 +1,9 @@
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Optional, Tuple
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class User:
     """User domain entity"""
     id: int
@@ -16,6 +16,10 @@ class User:
     last_active: Optional[datetime] = None
     download_count: int = 0
     is_banned: bool = False
+    # ISO renderings paired with the datetime they were formatted from, so reassigning
+    # a timestamp invalidates its rendering
+    _created_at_iso: Optional[Tuple[datetime, str]] = field(default=None, init=False, repr=False, compare=False)
+    _last_active_iso: Optional[Tuple[datetime, str]] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         if self.created_at is None:
@@ -23,6 +27,20 @@ class User:
         if self.last_active is None:
             self.last_active = datetime.now()
     
+    @property
+    def created_at_iso(self) -> str:
+        """ISO rendering of created_at, formatted once per value"""
+        if self._created_at_iso is None or self._created_at_iso[0] is not self.created_at:
+            self._created_at_iso = (self.created_at, self.created_at.isoformat())
+        return self._created_at_iso[1]
+    
+    @property
+    def last_active_iso(self) -> str:
+        """ISO rendering of last_active, formatted once per value"""
+        if self._last_active_iso is None or self._last_active_iso[0] is not self.last_active:
+            self._last_active_iso = (self.last_active, self.last_active.isoformat())
+        return self._last_active_iso[1]
+    
     def update_activity(self):
         """Update user's last activity timestamp"""
         self.last_active = datetime.now()
@@ -43,4 +61,12 @@ class User:
     def change_language(self, language: str):
         """Change user's language preference"""
         self.language = language
-        self.update_activity()
\ No newline at end of file
+        self.update_activity()
+    
+    def __eq__(self, other: object) -> bool:
+        """Check identity by ID only"""
+        return isinstance(other, User) and self.id == other.id
+    
+    def __hash__(self) -> int:
+        """Hash by ID so entities can be used in sets and as dict keys"""
+        return hash(self.id)
\ No newline at end of file
@@ -12,14 +12,20 @@ class AnalyticsRepository(ABC):
         """Save analytics record"""
         pass
     
+    async def save_many(self, records: List[Analytics]) -> List[Analytics]:
+        """Save several analytics records at once (override to write in one pass)"""
+        for analytics in records:
+            await self.save(analytics)
+        return records
+    
     @abstractmethod
     async def get_by_user_id(self, user_id: int, days: int = 30) -> List[Analytics]:
         """Get analytics for a specific user"""
         pass
     
     @abstractmethod
-    async def get_platform_stats(self, platform: str, days: int = 30) -> Dict[str, Any]:
-        """Get platform-specific statistics"""
+    async def get_platform_stats(self, platform: str, days: Optional[int] = 30) -> Dict[str, Any]:
+        """Get platform-specific statistics for the last days, or all time if days is None"""
         pass
     
     @abstractmethod
@@ -32,6 +38,18 @@ class AnalyticsRepository(ABC):
         """Get total download count"""
         pass
     
+    @abstractmethod
+    async def get_error_summary(self) -> Dict[str, Any]:
+        """
+        Get total download count together with failures grouped by error
+        
+        Returns:
+            Dict containing:
+            - total_downloads: number of finished downloads
+            - errors: failed download count per error message
+        """
+        pass
+    
     @abstractmethod
     async def get_downloads_by_date_range(
         self, start_date: datetime, end_date: datetime
@@ -42,4 +60,9 @@ class AnalyticsRepository(ABC):
     @abstractmethod
     async def get_top_users(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get top users by download count"""
+        pass
+    
+    @abstractmethod
+    async def cleanup_old_records(self, days: int = 90) -> int:
+        """Delete records older than specified days and return how many were deleted"""
         pass
\ No newline at end of file
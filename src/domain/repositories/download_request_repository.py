@@ -47,4 +47,14 @@ class DownloadRequestRepository(ABC):
         self, start_date: datetime, end_date: datetime
     ) -> List[DownloadRequest]:
         """Get requests within date range"""
+        pass
+    
+    @abstractmethod
+    async def count_pending_requests(self) -> int:
+        """Get pending request count"""
+        pass
+    
+    @abstractmethod
+    async def count_processing_requests(self) -> int:
+        """Get processing request count"""
         pass
\ No newline at end of file
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Dict, Tuple
 from ..entities.user import User
 
 
@@ -21,6 +21,29 @@ class UserRepository(ABC):
         """Get all users"""
         pass
     
+    @abstractmethod
+    async def upsert(self, user: User) -> Tuple[User, bool]:
+        """
+        Insert user, or refresh profile fields of an existing one in one step
+        
+        Existing users keep their language, download count, ban status and
+        creation time; username, names and last activity are updated.
+        
+        Returns:
+            Tuple of stored user and whether it was newly created
+        """
+        pass
+    
+    @abstractmethod
+    async def set_banned(self, user_id: int, banned: bool) -> Optional[User]:
+        """Set user's banned status in one step, returning updated user or None if not found"""
+        pass
+    
+    @abstractmethod
+    async def get_paginated(self, offset: int, limit: int) -> List[User]:
+        """Get a page of users"""
+        pass
+    
     @abstractmethod
     async def delete(self, user_id: int) -> bool:
         """Delete user by ID"""
@@ -41,7 +64,31 @@ class UserRepository(ABC):
         """Get all banned users"""
         pass
     
+    @abstractmethod
+    async def get_broadcast_recipients(self, language: Optional[str] = None) -> List[int]:
+        """Get IDs of users that are not banned, optionally filtered by language"""
+        pass
+    
     @abstractmethod
     async def count_total_users(self) -> int:
         """Get total user count"""
+        pass
+    
+    @abstractmethod
+    async def count_active_users(self, days: int = 30) -> int:
+        """Get count of users active within specified days"""
+        pass
+    
+    @abstractmethod
+    async def count_banned_users(self) -> int:
+        """Get banned user count"""
+        pass
+    
+    @abstractmethod
+    async def get_language_breakdown(self) -> Dict[str, int]:
+        """Get user count per language"""
+        pass
+    
+    async def close(self) -> None:
+        """Persist pending writes and release resources (no-op by default)"""
         pass
\ No newline at end of file
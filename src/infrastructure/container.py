@@ -4,6 +4,7 @@ Dependency Injection Container
 
 from typing import Dict, Any
 import asyncio
+import logging
 
 from ..shared.config.settings import Settings
 from ..domain.repositories.user_repository import UserRepository
@@ -21,6 +22,7 @@ from ..application.use_cases.admin_use_case import AdminUseCase
 # Infrastructure implementations
 from .repositories.json_user_repository import JsonUserRepository
 from .repositories.json_analytics_repository import JsonAnalyticsRepository
+from .repositories.buffered_analytics_repository import BufferedAnalyticsRepository
 from .repositories.json_download_request_repository import JsonDownloadRequestRepository
 from .external_services.instagram_downloader_service import InstagramDownloaderService
 from .external_services.tiktok_downloader_service import TikTokDownloaderService
@@ -28,6 +30,9 @@ from .external_services.composite_downloader_service import CompositeDownloaderS
 from .telegram.telegram_notification_service import TelegramNotificationService
 from .external_services.json_rate_limiter_service import JsonRateLimiterService
 from .external_services.json_translation_service import JsonTranslationService
+from .external_services.caching_translation_service import CachingTranslationService
+
+logger = logging.getLogger(__name__)
 
 
 class Container:
@@ -44,8 +49,14 @@ class Container:
         
         # Initialize repositories
         self._services['user_repository'] = JsonUserRepository(Settings.get_db_file_path("users.json"))
-        self._services['analytics_repository'] = JsonAnalyticsRepository(Settings.get_db_file_path("analytics.json"))
+        await self._services['user_repository'].preload()
+        self._services['analytics_repository'] = BufferedAnalyticsRepository(
+            JsonAnalyticsRepository(Settings.get_db_file_path("analytics.json")),
+            batch_size=Settings.ANALYTICS_BATCH_SIZE,
+            flush_interval=Settings.ANALYTICS_FLUSH_INTERVAL
+        )
         self._services['download_request_repository'] = JsonDownloadRequestRepository(Settings.get_db_file_path("download_requests.json"))
+        await self._services['download_request_repository'].preload()
         
         # Initialize external services
         instagram_downloader = InstagramDownloaderService()
@@ -53,7 +64,8 @@ class Container:
         self._services['downloader_service'] = CompositeDownloaderService([instagram_downloader, tiktok_downloader])
         
         self._services['rate_limiter_service'] = JsonRateLimiterService(Settings.get_db_file_path("rate_limits.json"))
-        self._services['translation_service'] = JsonTranslationService("locales")
+        self._services['translation_service'] = CachingTranslationService(JsonTranslationService("locales"))
+        await self._services['translation_service'].preload()
         
         # Notification service will be initialized when needed with bot instance
         self._services['notification_service'] = None
@@ -91,6 +103,21 @@ class Container:
         
         self._initialized = True
     
+    async def shutdown(self):
+        """Flush buffered writes before exit"""
+        if not self._initialized:
+            return
+        
+        # Close each service independently so one failed flush doesn't skip the rest
+        names = ['analytics_repository', 'user_repository', 'rate_limiter_service', 'translation_service', 'downloader_service']
+        results = await asyncio.gather(
+            *(self._services[name].close() for name in names),
+            return_exceptions=True
+        )
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to close {name}: {result}")
+    
     def get_user_repository(self) -> UserRepository:
         """Get user repository"""
         return self._services['user_repository']
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from typing import List, Optional, Dict, Any, Tuple
+
+from ...application.interfaces.translation_service import TranslationService
+from ...shared.config.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+# Cache markers: _UNSET means never looked up, _MISSING means the key has no translation
+_UNSET = object()
+_MISSING = object()
+
+
+class CachingTranslationService(TranslationService):
+    """Translation service decorator that caches templates per (key, language)"""
+    
+    def __init__(self, service: TranslationService):
+        self._service = service
+        self._cache: Dict[Tuple[str, str], Any] = {}
+        self._tables: Dict[str, Dict[str, str]] = {}
+        self._lock = asyncio.Lock()
+    
+    async def preload(self) -> None:
+        """Load all supported languages into memory so lookups need no I/O"""
+        tables = {}
+        for language in self._service.get_supported_languages():
+            tables[language] = await self._service.get_all_translations(language)
+        
+        # Merge English into every table up front so a lookup never needs a second fallback get
+        english = tables.get("en", {})
+        self._tables = {language: {**english, **table} for language, table in tables.items()}
+        self._cache.clear()
+        logger.info(f"Preloaded translations for {len(tables)} languages")
+    
+    def _lookup(self, key: str, language: str) -> Optional[str]:
+        """Resolve template from preloaded tables, which already include English fallbacks"""
+        table = self._tables.get(language) or self._tables.get(Settings.DEFAULT_LANGUAGE, {})
+        return table.get(key)
+    
+    async def _get_template(self, key: str, language: str) -> Optional[str]:
+        """Get unformatted translation template, or None if the key is missing"""
+        if self._tables:
+            return self._lookup(key, language)
+        
+        cache_key = (key, language)
+        template = self._cache.get(cache_key, _UNSET)
+        if template is _UNSET:
+            async with self._lock:
+                template = self._cache.get(cache_key, _UNSET)
+                if template is _UNSET:
+                    text = await self._service.get_text(key, language)
+                    # The wrapped service falls back to the key itself when untranslated
+                    template = _MISSING if text == key else text
+                    self._cache[cache_key] = template
+        
+        if template is _MISSING:
+            return None
+        return template
+    
+    async def get_text(
+        self, 
+        key: str, 
+        language: str = "en", 
+        **kwargs: Any
+    ) -> str:
+        """Get translated text for key in specified language"""
+        text = await self._get_template(key, language)
+        if text is None:
+            return key
+        
+        # Format text with provided kwargs
+        # Static texts (no placeholders) are returned as-is even when callers pass kwargs
+        if kwargs and "{" in text:
+            try:
+                text = text.format_map(kwargs)
+            except KeyError as e:
+                logger.warning(f"Missing format parameter {e} for key '{key}'")
+            except Exception as e:
+                logger.error(f"Error formatting text for key '{key}': {e}")
+        
+        return text
+    
+    def get_supported_languages(self) -> List[str]:
+        """Get list of supported language codes"""
+        return self._service.get_supported_languages()
+    
+    def is_language_supported(self, language: str) -> bool:
+        """Check if language is supported"""
+        return self._service.is_language_supported(language)
+    
+    def get_language_name(self, language_code: str, in_language: str = "en") -> str:
+        """Get language name in specified language"""
+        return self._service.get_language_name(language_code, in_language)
+    
+    def detect_language_from_text(self, text: str) -> Optional[str]:
+        """Detect language from text (if supported)"""
+        return self._service.detect_language_from_text(text)
+    
+    async def get_all_translations(self, language: str = "en") -> Dict[str, str]:
+        """Get all translations for a language"""
+        return await self._service.get_all_translations(language)
+    
+    async def reload_translations(self) -> bool:
+        """Reload translations from files and drop cached templates"""
+        self._cache.clear()
+        result = await self._service.reload_translations()
+        if self._tables:
+            await self.preload()
+        return result
+    
+    async def add_translation(
+        self,
+        key: str,
+        language: str,
+        text: str
+    ) -> bool:
+        """Add or update translation and drop cached templates"""
+        result = await self._service.add_translation(key, language, text)
+        # Other languages may fall back to this key, so clear everything
+        self._cache.clear()
+        if result and self._tables:
+            # An English addition changes every merged table, so rebuild them all
+            await self.preload()
+        return result
+    
+    async def get_missing_translations(self, reference_language: str = "en") -> Dict[str, List[str]]:
+        """Get missing translations for each language compared to reference"""
+        return await self._service.get_missing_translations(reference_language)
+    
+    async def close(self) -> None:
+        """Write pending changes of the wrapped service"""
+        await self._service.close()
\ No newline at end of file
@@ -1,10 +1,15 @@
 import asyncio
 import logging
-from typing import List, Optional, Dict, Any
+import os
+from collections import OrderedDict
+from typing import List, Optional, Dict, Any, Tuple
+from urllib.parse import urlsplit
 
 from ...application.interfaces.downloader_service import DownloaderService
 from ...domain.entities.download_request import DownloadRequest
 from ...shared.exceptions import DownloadError, UnsupportedUrlError
+from ...shared.config.constants import Constants
+from ...shared.config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
@@ -12,23 +17,76 @@ logger = logging.getLogger(__name__)
 class CompositeDownloaderService(DownloaderService):
     """Composite downloader service that delegates to platform-specific services"""
     
-    def __init__(self, downloaders: List[DownloaderService]):
+    def __init__(self, downloaders: List[DownloaderService], handler_cache_size: int = 1024):
         self.downloaders = downloaders
+        # Recently resolved URL -> handler, so one flow's repeated dispatches probe once
+        self._handler_cache: "OrderedDict[str, Optional[DownloaderService]]" = OrderedDict()
+        self._handler_cache_size = handler_cache_size
+        self._host_map = self._build_host_map()
+        self._platforms_cache: Optional[Tuple[str, ...]] = None
         logger.info(f"Initialized composite downloader with {len(downloaders)} services")
     
     async def can_handle(self, url: str) -> bool:
         """Check if any service can handle the given URL"""
+        handler = await self._get_handler(url)
+        if handler is None:
+            return False
+        
+        decided = handler.supports(url)
+        if decided is not None:
+            return decided
+        return await handler.can_handle(url)
+    
+    def _build_host_map(self) -> Dict[str, DownloaderService]:
+        """Map known hostnames of each downloader's platforms to that downloader"""
+        host_map = {}
         for downloader in self.downloaders:
-            if await downloader.can_handle(url):
-                return True
-        return False
+            for platform in downloader.get_supported_platforms():
+                for host in Constants.PLATFORM_HOSTS.get(platform, []):
+                    host_map.setdefault(host, downloader)
+        return host_map
     
     async def _get_handler(self, url: str) -> Optional[DownloaderService]:
         """Get the appropriate downloader service for URL"""
+        # Known hosts route directly; downloaders still reject unsupported paths themselves
+        host = (urlsplit(url).hostname or "").lower()
+        handler = self._host_map.get(host) or self._host_map.get(host.removeprefix("www."))
+        if handler:
+            return handler
+        
+        if url in self._handler_cache:
+            self._handler_cache.move_to_end(url)
+            return self._handler_cache[url]
+        
+        handler = await self._probe_handlers(url)
+        self._handler_cache[url] = handler
+        if len(self._handler_cache) > self._handler_cache_size:
+            self._handler_cache.popitem(last=False)
+        return handler
+    
+    async def _probe_handlers(self, url: str) -> Optional[DownloaderService]:
+        """Ask all downloaders concurrently and return the first that accepts URL"""
+        # Cheap synchronous checks first; only undecided downloaders need an await
+        undecided = []
         for downloader in self.downloaders:
-            if await downloader.can_handle(url):
+            decided = downloader.supports(url)
+            if decided:
                 return downloader
-        return None
+            if decided is None:
+                undecided.append(downloader)
+        
+        tasks = {asyncio.create_task(downloader.can_handle(url)): downloader for downloader in undecided}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.result():
+                        return tasks[task]
+            return None
+        finally:
+            for task in pending:
+                task.cancel()
     
     async def extract_media_info(self, url: str) -> Dict[str, Any]:
         """Extract media information from URL without downloading"""
@@ -67,16 +125,43 @@ class CompositeDownloaderService(DownloaderService):
     
     def get_supported_platforms(self) -> List[str]:
         """Get list of all supported platforms"""
-        platforms = []
+        if self._platforms_cache is None:
+            # Deduplicate while keeping registration order
+            self._platforms_cache = tuple(dict.fromkeys(
+                platform
+                for downloader in self.downloaders
+                for platform in downloader.get_supported_platforms()
+            ))
+        return list(self._platforms_cache)
+    
+    def _get_producer(self, file_path: str) -> Optional[DownloaderService]:
+        """Get the downloader that produced a file from its "<platform>_" prefix under TEMP_DIR"""
+        relative_path = os.path.relpath(os.path.abspath(file_path), os.path.abspath(Settings.TEMP_DIR))
+        platform = relative_path.split(os.sep, 1)[0].split("_", 1)[0]
         for downloader in self.downloaders:
-            platforms.extend(downloader.get_supported_platforms())
-        return list(set(platforms))  # Remove duplicates
+            if platform in downloader.get_supported_platforms():
+                return downloader
+        return None
     
     async def cleanup_temp_files(self, file_paths: List[str]) -> None:
-        """Clean up temporary files using all available services"""
-        cleanup_tasks = []
-        for downloader in self.downloaders:
-            cleanup_tasks.append(downloader.cleanup_temp_files(file_paths))
+        """Clean up temporary files using the services that produced them"""
+        # Group files by producer; files of unknown origin go to every service
+        files_by_downloader: Dict[DownloaderService, List[str]] = {}
+        unknown_files = []
+        for file_path in file_paths:
+            producer = self._get_producer(file_path)
+            if producer is None:
+                unknown_files.append(file_path)
+            else:
+                files_by_downloader.setdefault(producer, []).append(file_path)
+        
+        cleanup_tasks = [
+            downloader.cleanup_temp_files(paths)
+            for downloader, paths in files_by_downloader.items()
+        ]
+        if unknown_files:
+            for downloader in self.downloaders:
+                cleanup_tasks.append(downloader.cleanup_temp_files(unknown_files))
         
         # Run all cleanup operations concurrently
         try:
@@ -84,14 +169,24 @@ class CompositeDownloaderService(DownloaderService):
         except Exception as e:
             logger.error(f"Error during composite cleanup: {e}")
     
+    async def close(self) -> None:
+        """Release resources held by every downloader"""
+        await asyncio.gather(*(downloader.close() for downloader in self.downloaders))
+    
     def add_downloader(self, downloader: DownloaderService):
         """Add a new downloader service"""
         self.downloaders.append(downloader)
+        self._host_map = self._build_host_map()
+        self._handler_cache.clear()
+        self._platforms_cache = None
         logger.info(f"Added {downloader.__class__.__name__} to composite service")
     
     def remove_downloader(self, downloader_class: type):
         """Remove downloader service by class"""
         self.downloaders = [d for d in self.downloaders if not isinstance(d, downloader_class)]
+        self._host_map = self._build_host_map()
+        self._handler_cache.clear()
+        self._platforms_cache = None
         logger.info(f"Removed {downloader_class.__name__} from composite service")
     
     def get_downloader_count(self) -> int:
@@ -2,11 +2,15 @@ import asyncio
 import logging
 import tempfile
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Iterator
 import instaloader
 from urllib.parse import urlparse
 import re
 import os
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, lru_cache
 
 from ...application.interfaces.downloader_service import DownloaderService
 from ...domain.entities.download_request import DownloadRequest
@@ -15,6 +19,44 @@ from ...shared.config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# One alternation covering posts, reels, IGTV, stories and short links, scanned once per URL;
+# the shortcode group is empty for stories
+_INSTAGRAM_URL_PATTERN = re.compile(
+    r'https?://(?:www\.)?(?:'
+    r'(?:instagram\.com/(?:p|reel|tv)|instagr\.am/p)/(?P<shortcode>[\w-]+)'
+    r'|instagram\.com/stories/[\w.-]+/\d+'
+    r')'
+)
+_MEDIA_SUFFIXES = frozenset({'.jpg', '.jpeg', '.png', '.mp4', '.mov'})
+
+
+@lru_cache(maxsize=1024)
+def _parse_url(url: str) -> Tuple[bool, Optional[str]]:
+    """Get whether URL is supported and its shortcode, cached since retries and forwards repeat URLs"""
+    match = _INSTAGRAM_URL_PATTERN.match(url)
+    if match is None:
+        return False, None
+    return True, match.group("shortcode")
+
+
+def _iter_files(directory: str) -> Iterator[os.DirEntry]:
+    """Recursively yield file entries under directory, reusing scandir's cached stat data"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _iter_files(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                yield entry
+
+
+def _remove_dir_if_empty(directory: str) -> bool:
+    """Remove directory if it has no entries left"""
+    with os.scandir(directory) as entries:
+        if next(entries, None) is not None:
+            return False
+    os.rmdir(directory)
+    return True
+
 
 class InstagramDownloaderService(DownloaderService):
     """Instagram media downloader service using instaloader"""
@@ -22,30 +64,51 @@ class InstagramDownloaderService(DownloaderService):
     def __init__(self):
         self.session_file = Path(Settings.INSTAGRAM_SESSION_FILE)
         self._loader = None
-        self._session_lock = asyncio.Lock()
+        self._loader_ready = asyncio.Event()
+        
+        # Separate pools so quick metadata lookups don't queue behind long downloads,
+        # and neither starves the default executor used for file I/O elsewhere
+        self._download_executor = ThreadPoolExecutor(
+            max_workers=Settings.MAX_CONCURRENT_DOWNLOADS,
+            thread_name_prefix="instagram-download"
+        )
+        self._metadata_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="instagram-metadata")
+        
+        # Posts fetched recently, so validate -> info -> download hits Instagram once
+        self._post_cache: Dict[str, Tuple[float, instaloader.Post]] = {}
+        self._post_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self._post_cache_ttl = 300
     
     async def _get_loader(self) -> instaloader.Instaloader:
         """Get configured instaloader instance"""
-        if self._loader is None:
-            async with self._session_lock:
-                if self._loader is None:
-                    # Configure instaloader
-                    self._loader = instaloader.Instaloader(
-                        dirname_pattern=str(Settings.TEMP_DIR / "{target}"),
-                        filename_pattern="{date_utc:%Y%m%d_%H%M%S}_{shortcode}",
-                        download_video_thumbnails=False,
-                        download_geotags=False,
-                        download_comments=False,
-                        save_metadata=False,
-                        compress_json=False,
-                        max_connection_attempts=3,
-                        request_timeout=Settings.TIMEOUT_SECONDS,
-                        sleep=True,
-                        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                    )
-                    
-                    # Try to load session if available
-                    await self._load_session()
+        if self._loader_ready.is_set():
+            return self._loader
+        
+        if self._loader is not None:
+            # Another caller is still loading the session
+            await self._loader_ready.wait()
+            return self._loader
+        
+        # Construction does not await, so no other caller can get here first
+        self._loader = instaloader.Instaloader(
+            dirname_pattern=str(Settings.TEMP_DIR / "{target}"),
+            filename_pattern="{date_utc:%Y%m%d_%H%M%S}_{shortcode}",
+            download_video_thumbnails=False,
+            download_geotags=False,
+            download_comments=False,
+            save_metadata=False,
+            compress_json=False,
+            max_connection_attempts=3,
+            request_timeout=Settings.TIMEOUT_SECONDS,
+            sleep=True,
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+        )
+        
+        try:
+            # Try to load session if available
+            await self._load_session()
+        finally:
+            self._loader_ready.set()
         
         return self._loader
     
@@ -53,65 +116,73 @@ class InstagramDownloaderService(DownloaderService):
         """Load Instagram session if available"""
         try:
             if self.session_file.exists() and Settings.INSTAGRAM_USERNAME:
-                loop = asyncio.get_event_loop()
+                loop = asyncio.get_running_loop()
                 await loop.run_in_executor(
-                    None,
-                    lambda: self._loader.load_session_from_file(
-                        Settings.INSTAGRAM_USERNAME,
-                        str(self.session_file)
-                    )
+                    self._metadata_executor,
+                    self._loader.load_session_from_file,
+                    Settings.INSTAGRAM_USERNAME,
+                    str(self.session_file)
                 )
                 logger.info("Instagram session loaded successfully")
         except Exception as e:
             logger.warning(f"Failed to load Instagram session: {e}")
     
+    async def _get_post(self, shortcode: str) -> instaloader.Post:
+        """Get post by shortcode, reusing a recent fetch of the same post"""
+        entry = self._post_cache.get(shortcode)
+        if entry is not None and time.monotonic() < entry[0]:
+            return entry[1]
+        
+        lock = self._post_locks[shortcode]
+        try:
+            async with lock:
+                # Another caller may have fetched it while we waited
+                entry = self._post_cache.get(shortcode)
+                if entry is not None and time.monotonic() < entry[0]:
+                    return entry[1]
+                
+                loader = await self._get_loader()
+                loop = asyncio.get_running_loop()
+                post = await loop.run_in_executor(
+                    self._metadata_executor,
+                    instaloader.Post.from_shortcode,
+                    loader.context,
+                    shortcode
+                )
+                
+                now = time.monotonic()
+                for key in [key for key, (expires_at, _) in self._post_cache.items() if expires_at <= now]:
+                    del self._post_cache[key]
+                self._post_cache[shortcode] = (now + self._post_cache_ttl, post)
+                return post
+        finally:
+            if not lock.locked():
+                self._post_locks.pop(shortcode, None)
+    
     async def can_handle(self, url: str) -> bool:
         """Check if service can handle the given URL"""
-        instagram_patterns = [
-            r'https?://(?:www\.)?instagram\.com/p/[\w-]+',
-            r'https?://(?:www\.)?instagram\.com/reel/[\w-]+',
-            r'https?://(?:www\.)?instagram\.com/tv/[\w-]+',
-            r'https?://(?:www\.)?instagram\.com/stories/[\w.-]+/\d+',
-            r'https?://(?:www\.)?instagr\.am/p/[\w-]+',
-        ]
-        
-        return any(re.match(pattern, url) for pattern in instagram_patterns)
+        return self.supports(url)
+    
+    def supports(self, url: str) -> Optional[bool]:
+        """Synchronously check URL against supported patterns"""
+        return _parse_url(url)[0]
     
     def _extract_shortcode(self, url: str) -> Optional[str]:
         """Extract Instagram shortcode from URL"""
-        patterns = [
-            r'/p/([A-Za-z0-9_-]+)',
-            r'/reel/([A-Za-z0-9_-]+)',
-            r'/tv/([A-Za-z0-9_-]+)',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        
-        return None
+        return _parse_url(url)[1]
     
     async def extract_media_info(self, url: str) -> Dict[str, Any]:
         """Extract media information from URL without downloading"""
         try:
-            if not await self.can_handle(url):
+            # Single match serves both the support check and shortcode extraction
+            supported, shortcode = _parse_url(url)
+            if not supported:
                 raise UnsupportedUrlError(f"URL not supported: {url}")
             
-            shortcode = self._extract_shortcode(url)
             if not shortcode:
                 raise UnsupportedUrlError(f"Could not extract shortcode from URL: {url}")
             
-            loader = await self._get_loader()
-            
-            # Use executor to run blocking instaloader operations
-            loop = asyncio.get_event_loop()
-            post = await loop.run_in_executor(
-                None,
-                instaloader.Post.from_shortcode,
-                loader.context,
-                shortcode
-            )
+            post = await self._get_post(shortcode)
             
             media_info = {
                 "shortcode": post.shortcode,
@@ -155,13 +226,8 @@ class InstagramDownloaderService(DownloaderService):
             loader.dirname_pattern = str(temp_dir / "{target}")
             
             # Download the post
-            loop = asyncio.get_event_loop()
-            post = await loop.run_in_executor(
-                None,
-                instaloader.Post.from_shortcode,
-                loader.context,
-                shortcode
-            )
+            post = await self._get_post(shortcode)
+            loop = asyncio.get_running_loop()
             
             # Check file size before download
             if hasattr(post, 'video_url') and post.is_video:
@@ -170,10 +236,8 @@ class InstagramDownloaderService(DownloaderService):
             
             # Download the post
             await loop.run_in_executor(
-                None,
-                loader.download_post,
-                post,
-                target=shortcode
+                self._download_executor,
+                partial(loader.download_post, post, target=shortcode)
             )
             
             # Find downloaded files
@@ -181,16 +245,15 @@ class InstagramDownloaderService(DownloaderService):
             target_dir = temp_dir / shortcode
             
             if target_dir.exists():
-                for file_path in target_dir.rglob("*"):
-                    if file_path.is_file() and file_path.suffix.lower() in ['.jpg', '.jpeg', '.png', '.mp4', '.mov']:
+                for entry in _iter_files(str(target_dir)):
+                    if os.path.splitext(entry.name)[1].lower() in _MEDIA_SUFFIXES:
                         # Check file size
-                        file_size = file_path.stat().st_size
-                        max_size = Settings.MAX_FILE_SIZE * 1024 * 1024  # Convert MB to bytes
+                        file_size = entry.stat().st_size
                         
-                        if file_size <= max_size:
-                            downloaded_files.append(str(file_path))
+                        if file_size <= Settings.MAX_FILE_SIZE_BYTES:
+                            downloaded_files.append(entry.path)
                         else:
-                            logger.warning(f"File {file_path} exceeds size limit: {file_size} bytes")
+                            logger.warning(f"File {entry.path} exceeds size limit: {file_size} bytes")
             
             if not downloaded_files:
                 raise DownloadError("No media files were downloaded or all files exceed size limit")
@@ -229,29 +292,45 @@ class InstagramDownloaderService(DownloaderService):
         """Get list of supported platforms"""
         return ["instagram"]
     
+    async def close(self) -> None:
+        """Stop both worker pools without waiting for running instaloader calls"""
+        self._download_executor.shutdown(wait=False, cancel_futures=True)
+        self._metadata_executor.shutdown(wait=False, cancel_futures=True)
+    
     async def cleanup_temp_files(self, file_paths: List[str]) -> None:
         """Clean up temporary files"""
         try:
+            temp_root = os.path.abspath(Settings.TEMP_DIR)
+            
+            # Group files by directory so each directory is listed once instead of once per file
+            files_by_dir: Dict[str, List[str]] = defaultdict(list)
             for file_path in file_paths:
-                path = Path(file_path)
-                if path.exists():
-                    # Remove file
-                    path.unlink()
-                    
-                    # Try to remove parent directory if empty
-                    try:
-                        parent = path.parent
-                        if parent.exists() and not any(parent.iterdir()):
-                            parent.rmdir()
-                            
-                            # Try to remove grandparent if empty
-                            grandparent = parent.parent
-                            if grandparent.exists() and grandparent != Settings.TEMP_DIR:
-                                if not any(grandparent.iterdir()):
-                                    grandparent.rmdir()
-                    except Exception:
-                        pass  # Ignore cleanup errors for directories
-                        
+                files_by_dir[os.path.dirname(os.path.abspath(file_path))].append(file_path)
+            
+            for directory, paths in files_by_dir.items():
+                try:
+                    with os.scandir(directory) as entries:
+                        remaining = {entry.name for entry in entries}
+                except FileNotFoundError:
+                    continue
+                
+                for file_path in paths:
+                    name = os.path.basename(file_path)
+                    if name in remaining:
+                        os.unlink(file_path)
+                        remaining.discard(name)
+                
+                # Try to remove the directory and its parent if they are now empty
+                if remaining or directory == temp_root:
+                    continue
+                try:
+                    os.rmdir(directory)
+                    parent = os.path.dirname(directory)
+                    if parent != temp_root:
+                        _remove_dir_if_empty(parent)
+                except OSError:
+                    pass  # Ignore cleanup errors for directories
+            
             logger.debug(f"Cleaned up {len(file_paths)} temporary files")
         except Exception as e:
             logger.error(f"Error cleaning up temporary files: {e}") 
\ No newline at end of file
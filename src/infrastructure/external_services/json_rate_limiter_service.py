@@ -1,13 +1,16 @@
-import json
 import asyncio
+import bisect
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 import logging
+import orjson
 
-from ...application.interfaces.rate_limiter_service import RateLimiterService
+from ...application.interfaces.rate_limiter_service import RateLimiterService, RateLimitResult
 from ...shared.exceptions import RepositoryError
 from ...shared.config.settings import Settings
+from ...shared.utils import atomic_write_bytes, DebouncedFlush
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +18,15 @@ logger = logging.getLogger(__name__)
 class JsonRateLimiterService(RateLimiterService):
     """JSON-based rate limiter service implementation"""
     
-    def __init__(self, file_path: Path):
+    def __init__(self, file_path: Path, flush_delay: float = 1.0):
         self.file_path = Path(file_path)
         self._lock = asyncio.Lock()
         self._ensure_file_exists()
         
+        # Limits are kept in memory and written back after flush_delay
+        self._data: Dict[str, Any] = self._load_file()
+        self._flusher = DebouncedFlush(lambda: self._write_file(self._data), flush_delay)
+        
         # Default rate limits
         self.default_limits = {
             "download": {
@@ -42,37 +49,51 @@ class JsonRateLimiterService(RateLimiterService):
             logger.error(f"Failed to ensure rate limiter file exists: {e}")
             raise RepositoryError(f"Failed to initialize rate limiter: {e}")
     
-    async def _read_data(self) -> Dict[str, Any]:
-        """Read data from JSON file"""
+    def _load_file(self) -> Dict[str, Any]:
+        """Read data from JSON file once at startup"""
         try:
-            loop = asyncio.get_event_loop()
-            content = await loop.run_in_executor(
-                None, 
-                lambda: self.file_path.read_text(encoding="utf-8")
-            )
-            return json.loads(content)
-        except json.JSONDecodeError as e:
+            return self._migrate(orjson.loads(self.file_path.read_bytes()))
+        except orjson.JSONDecodeError as e:
+            # Writes are atomic, so a corrupt file needs attention rather than being reset
             logger.error(f"Invalid JSON in rate limiter file: {e}")
-            # Reset file if corrupted
-            await self._write_data({})
-            return {}
+            raise RepositoryError(f"Failed to parse rate limiter data: {e}")
         except Exception as e:
             logger.error(f"Error reading rate limiter data: {e}")
             raise RepositoryError(f"Failed to read rate limiter data: {e}")
     
-    async def _write_data(self, data: Dict[str, Any]):
-        """Write data to JSON file"""
+    def _migrate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert block times stored as ISO strings by older versions to epoch seconds"""
+        for user_data in data.values():
+            blocked_until = user_data.get("blocked_until")
+            if isinstance(blocked_until, str) and blocked_until != "permanent":
+                try:
+                    user_data["blocked_until"] = datetime.fromisoformat(blocked_until).timestamp()
+                except ValueError:
+                    del user_data["blocked_until"]
+        return data
+    
+    def _read_data(self) -> Dict[str, Any]:
+        """Get in-memory rate limit data"""
+        return self._data
+    
+    async def _write_file(self, data: Dict[str, Any]):
+        """Atomically write data to JSON file"""
         try:
-            loop = asyncio.get_event_loop()
-            content = json.dumps(data, indent=2, default=str, ensure_ascii=False)
-            await loop.run_in_executor(
-                None,
-                lambda: self.file_path.write_text(content, encoding="utf-8")
-            )
+            # Compact output; the file is rewritten on every flush and never hand-edited
+            content = orjson.dumps(data)
+            await asyncio.to_thread(atomic_write_bytes, self.file_path, content)
         except Exception as e:
             logger.error(f"Error writing rate limiter data: {e}")
             raise RepositoryError(f"Failed to write rate limiter data: {e}")
     
+    def _write_data(self):
+        """Mark in-memory data as changed and schedule a debounced write to file"""
+        self._flusher.schedule()
+    
+    async def close(self) -> None:
+        """Write pending changes to file immediately"""
+        await self._flusher.close()
+    
     def _get_user_key(self, user_id: int) -> str:
         """Get user key for storage"""
         return f"user_{user_id}"
@@ -84,78 +105,109 @@ class JsonRateLimiterService(RateLimiterService):
     async def is_rate_limited(self, user_id: int, action: str = "download") -> bool:
         """Check if user is rate limited for specific action"""
         try:
-            # Check if user is blocked
-            if await self.is_user_blocked(user_id):
+            # Block and window checks share one lookup of the user's entry
+            user_data = self._read_data().get(self._get_user_key(user_id), {})
+            now_ms = self._now_ms()
+            if self._is_blocked(user_data, now_ms / 1000):
                 return True
             
-            data = await self._read_data()
-            user_key = self._get_user_key(user_id)
-            action_key = self._get_action_key(action)
-            
-            # Get user data
-            user_data = data.get(user_key, {})
-            action_data = user_data.get(action_key, {})
-            
-            if not action_data:
-                return False
-            
-            # Get limit configuration
-            custom_limits = user_data.get("custom_limits", {})
-            if action in custom_limits:
-                limit_config = custom_limits[action]
-            else:
-                limit_config = self.default_limits.get(action, {
-                    "requests": 10,
-                    "period_seconds": 60
-                })
-            
-            # Check if within time window
-            reset_time = datetime.fromisoformat(action_data.get("reset_time", "2000-01-01T00:00:00"))
-            current_time = datetime.now()
-            
-            if current_time >= reset_time:
-                # Reset the counter
-                return False
-            
-            # Check if limit exceeded
-            used_requests = action_data.get("used", 0)
-            max_requests = limit_config["requests"]
-            
-            return used_requests >= max_requests
+            max_requests, _, window = self._get_state(user_data, action, now_ms)
+            return len(window) >= max_requests
             
         except Exception as e:
             logger.error(f"Error checking rate limit for user {user_id}: {e}")
             return False  # Fail open to avoid blocking users on errors
     
+    def _get_limit_config(self, user_data: Dict[str, Any], action: str) -> Dict[str, int]:
+        """Get limit configuration for action, preferring user's custom limit"""
+        custom_limits = user_data.get("custom_limits", {})
+        if action in custom_limits:
+            return custom_limits[action]
+        return self.default_limits.get(action, {
+            "requests": 10,
+            "period_seconds": 60
+        })
+    
+    def _get_state(self, user_data: Dict[str, Any], action: str, now_ms: int) -> Tuple[int, int, List[int]]:
+        """Get request limit, period and current rolling window of a user's action"""
+        limit_config = self._get_limit_config(user_data, action)
+        period_seconds = limit_config["period_seconds"]
+        window = self._get_window(user_data.get(self._get_action_key(action), {}), period_seconds, now_ms)
+        return limit_config["requests"], period_seconds, window
+    
+    def _now_ms(self) -> int:
+        """Get current time in epoch milliseconds"""
+        return int(time.time() * 1000)
+    
+    def _get_window(self, action_data: Dict[str, Any], period_seconds: int, now_ms: int) -> List[int]:
+        """Get request timestamps (epoch ms, ascending) still inside the rolling window"""
+        timestamps = action_data.get("timestamps", [])
+        cutoff = now_ms - period_seconds * 1000
+        # Timestamps are appended in order, so expired ones form a prefix
+        return timestamps[bisect.bisect_right(timestamps, cutoff):]
+    
+    def _get_reset_time(self, window: List[int], period_seconds: int, now_ms: int) -> float:
+        """Get epoch time when the oldest request in the window expires and frees a slot"""
+        oldest = window[0] if window else now_ms
+        return oldest / 1000 + period_seconds
+    
+    def _is_blocked(self, user_data: Dict[str, Any], now: float) -> bool:
+        """Check if user's block (epoch seconds or "permanent") is still in effect"""
+        blocked_until = user_data.get("blocked_until")
+        if not blocked_until:
+            return False
+        return blocked_until == "permanent" or now < blocked_until
+    
+    async def check_and_consume(self, user_id: int, action: str = "download") -> RateLimitResult:
+        """Atomically check the rate limit and consume one request if allowed"""
+        async with self._lock:
+            try:
+                data = self._read_data()
+                user_key = self._get_user_key(user_id)
+                action_key = self._get_action_key(action)
+                user_data = data.get(user_key, {})
+                now_ms = self._now_ms()
+                
+                # Check if user is blocked
+                if self._is_blocked(user_data, now_ms / 1000):
+                    blocked_until = user_data["blocked_until"]
+                    reset_at = None if blocked_until == "permanent" else datetime.fromtimestamp(blocked_until)
+                    return RateLimitResult(allowed=False, remaining=0, reset_at=reset_at)
+                
+                max_requests, period_seconds, window = self._get_state(user_data, action, now_ms)
+                
+                if len(window) >= max_requests:
+                    return RateLimitResult(
+                        allowed=False,
+                        remaining=0,
+                        reset_at=datetime.fromtimestamp(self._get_reset_time(window, period_seconds, now_ms))
+                    )
+                
+                window.append(now_ms)
+                user_data[action_key] = {"timestamps": window}
+                data[user_key] = user_data
+                
+                self._write_data()
+                logger.debug(f"Consumed {action} request for user {user_id}: {len(window)}/{max_requests}")
+                return RateLimitResult(
+                    allowed=True,
+                    remaining=max(0, max_requests - len(window)),
+                    reset_at=datetime.fromtimestamp(self._get_reset_time(window, period_seconds, now_ms))
+                )
+                
+            except Exception as e:
+                logger.error(f"Error checking and consuming rate limit for user {user_id}: {e}")
+                return RateLimitResult(allowed=True, remaining=0)  # Fail open to avoid blocking users on errors
+    
     async def get_rate_limit_info(self, user_id: int, action: str = "download") -> Dict[str, Any]:
         """Get rate limit information for user"""
         try:
-            data = await self._read_data()
-            user_key = self._get_user_key(user_id)
-            action_key = self._get_action_key(action)
+            user_data = self._read_data().get(self._get_user_key(user_id), {})
+            now_ms = self._now_ms()
             
-            user_data = data.get(user_key, {})
-            action_data = user_data.get(action_key, {})
-            
-            # Get limit configuration
-            custom_limits = user_data.get("custom_limits", {})
-            if action in custom_limits:
-                limit_config = custom_limits[action]
-            else:
-                limit_config = self.default_limits.get(action, {
-                    "requests": 10,
-                    "period_seconds": 60
-                })
-            
-            current_time = datetime.now()
-            reset_time = datetime.fromisoformat(action_data.get("reset_time", current_time.isoformat()))
-            used_requests = action_data.get("used", 0)
-            total_limit = limit_config["requests"]
-            
-            # If past reset time, reset counters
-            if current_time >= reset_time:
-                used_requests = 0
-                reset_time = current_time + timedelta(seconds=limit_config["period_seconds"])
+            total_limit, period_seconds, window = self._get_state(user_data, action, now_ms)
+            used_requests = len(window)
+            reset_time = datetime.fromtimestamp(self._get_reset_time(window, period_seconds, now_ms))
             
             remaining = max(0, total_limit - used_requests)
             
@@ -164,7 +216,7 @@ class JsonRateLimiterService(RateLimiterService):
                 "reset_time": reset_time.isoformat(),
                 "total_limit": total_limit,
                 "used": used_requests,
-                "period_seconds": limit_config["period_seconds"]
+                "period_seconds": period_seconds
             }
             
         except Exception as e:
@@ -181,7 +233,7 @@ class JsonRateLimiterService(RateLimiterService):
         """Increment usage count for user and action"""
         async with self._lock:
             try:
-                data = await self._read_data()
+                data = self._read_data()
                 user_key = self._get_user_key(user_id)
                 action_key = self._get_action_key(action)
                 
@@ -190,39 +242,16 @@ class JsonRateLimiterService(RateLimiterService):
                     data[user_key] = {}
                 
                 user_data = data[user_key]
+                limit_config = self._get_limit_config(user_data, action)
+                now_ms = self._now_ms()
                 
-                # Get limit configuration
-                custom_limits = user_data.get("custom_limits", {})
-                if action in custom_limits:
-                    limit_config = custom_limits[action]
-                else:
-                    limit_config = self.default_limits.get(action, {
-                        "requests": 10,
-                        "period_seconds": 60
-                    })
-                
-                current_time = datetime.now()
-                
-                # Initialize or reset action data if needed
-                if action_key not in user_data:
-                    user_data[action_key] = {
-                        "used": 0,
-                        "reset_time": (current_time + timedelta(seconds=limit_config["period_seconds"])).isoformat()
-                    }
-                
-                action_data = user_data[action_key]
-                reset_time = datetime.fromisoformat(action_data["reset_time"])
-                
-                # Reset if past reset time
-                if current_time >= reset_time:
-                    action_data["used"] = 0
-                    action_data["reset_time"] = (current_time + timedelta(seconds=limit_config["period_seconds"])).isoformat()
+                # Drop requests that fell out of the window, then record this one
+                window = self._get_window(user_data.get(action_key, {}), limit_config["period_seconds"], now_ms)
+                window.append(now_ms)
+                user_data[action_key] = {"timestamps": window}
                 
-                # Increment usage
-                action_data["used"] += 1
-                
-                await self._write_data(data)
-                logger.debug(f"Incremented {action} usage for user {user_id}: {action_data['used']}")
+                self._write_data()
+                logger.debug(f"Incremented {action} usage for user {user_id}: {len(window)}")
                 return True
                 
             except Exception as e:
@@ -233,7 +262,7 @@ class JsonRateLimiterService(RateLimiterService):
         """Reset all rate limits for a user (admin function)"""
         async with self._lock:
             try:
-                data = await self._read_data()
+                data = self._read_data()
                 user_key = self._get_user_key(user_id)
                 
                 if user_key in data:
@@ -249,7 +278,7 @@ class JsonRateLimiterService(RateLimiterService):
                     if blocked_until:
                         data[user_key]["blocked_until"] = blocked_until
                     
-                    await self._write_data(data)
+                    self._write_data()
                     logger.info(f"Reset rate limits for user {user_id}")
                 
                 return True
@@ -268,7 +297,7 @@ class JsonRateLimiterService(RateLimiterService):
         """Set custom rate limit for specific user"""
         async with self._lock:
             try:
-                data = await self._read_data()
+                data = self._read_data()
                 user_key = self._get_user_key(user_id)
                 
                 if user_key not in data:
@@ -282,7 +311,7 @@ class JsonRateLimiterService(RateLimiterService):
                     "period_seconds": period_seconds
                 }
                 
-                await self._write_data(data)
+                self._write_data()
                 logger.info(f"Set custom limit for user {user_id}, action {action}: {limit}/{period_seconds}s")
                 return True
                 
@@ -293,15 +322,13 @@ class JsonRateLimiterService(RateLimiterService):
     async def get_time_until_reset(self, user_id: int, action: str = "download") -> Optional[timedelta]:
         """Get time until rate limit resets"""
         try:
-            rate_info = await self.get_rate_limit_info(user_id, action)
-            reset_time = datetime.fromisoformat(rate_info["reset_time"])
-            current_time = datetime.now()
+            user_data = self._read_data().get(self._get_user_key(user_id), {})
+            now_ms = self._now_ms()
+            
+            _, period_seconds, window = self._get_state(user_data, action, now_ms)
+            reset_time = self._get_reset_time(window, period_seconds, now_ms)
+            return timedelta(seconds=max(0.0, reset_time - now_ms / 1000))
             
-            if reset_time > current_time:
-                return reset_time - current_time
-            else:
-                return timedelta(0)
-                
         except Exception as e:
             logger.error(f"Error getting reset time for user {user_id}: {e}")
             return None
@@ -309,20 +336,9 @@ class JsonRateLimiterService(RateLimiterService):
     async def is_user_blocked(self, user_id: int) -> bool:
         """Check if user is completely blocked"""
         try:
-            data = await self._read_data()
+            data = self._read_data()
             user_key = self._get_user_key(user_id)
-            user_data = data.get(user_key, {})
-            
-            blocked_until = user_data.get("blocked_until")
-            if not blocked_until:
-                return False
-            
-            if blocked_until == "permanent":
-                return True
-            
-            # Check if temporary block has expired
-            block_time = datetime.fromisoformat(blocked_until)
-            return datetime.now() < block_time
+            return self._is_blocked(data.get(user_key, {}), time.time())
             
         except Exception as e:
             logger.error(f"Error checking if user {user_id} is blocked: {e}")
@@ -332,7 +348,7 @@ class JsonRateLimiterService(RateLimiterService):
         """Block user for specified duration (None = permanent)"""
         async with self._lock:
             try:
-                data = await self._read_data()
+                data = self._read_data()
                 user_key = self._get_user_key(user_id)
                 
                 if user_key not in data:
@@ -341,10 +357,9 @@ class JsonRateLimiterService(RateLimiterService):
                 if duration_hours is None:
                     data[user_key]["blocked_until"] = "permanent"
                 else:
-                    block_until = datetime.now() + timedelta(hours=duration_hours)
-                    data[user_key]["blocked_until"] = block_until.isoformat()
+                    data[user_key]["blocked_until"] = time.time() + duration_hours * 3600
                 
-                await self._write_data(data)
+                self._write_data()
                 logger.info(f"Blocked user {user_id} for {duration_hours or 'permanent'} hours")
                 return True
                 
@@ -356,12 +371,12 @@ class JsonRateLimiterService(RateLimiterService):
         """Unblock user"""
         async with self._lock:
             try:
-                data = await self._read_data()
+                data = self._read_data()
                 user_key = self._get_user_key(user_id)
                 
                 if user_key in data and "blocked_until" in data[user_key]:
                     del data[user_key]["blocked_until"]
-                    await self._write_data(data)
+                    self._write_data()
                     logger.info(f"Unblocked user {user_id}")
                 
                 return True
@@ -374,37 +389,36 @@ class JsonRateLimiterService(RateLimiterService):
         """Clean up expired rate limit entries"""
         async with self._lock:
             try:
-                data = await self._read_data()
-                current_time = datetime.now()
+                now_ms = self._now_ms()
+                now = now_ms / 1000
                 cleaned_count = 0
+                new_data = {}
                 
-                for user_key, user_data in list(data.items()):
-                    # Clean up expired action data
-                    for action_key, action_data in list(user_data.items()):
-                        if action_key.startswith("action_") and isinstance(action_data, dict):
-                            reset_time = datetime.fromisoformat(action_data.get("reset_time", current_time.isoformat()))
-                            if current_time >= reset_time:
-                                del user_data[action_key]
-                                cleaned_count += 1
-                    
-                    # Clean up expired blocks
-                    blocked_until = user_data.get("blocked_until")
-                    if blocked_until and blocked_until != "permanent":
-                        try:
-                            block_time = datetime.fromisoformat(blocked_until)
-                            if current_time >= block_time:
-                                del user_data["blocked_until"]
+                # Build the surviving entries in one pass instead of deleting while iterating
+                for user_key, user_data in self._read_data().items():
+                    kept = {}
+                    for key, value in user_data.items():
+                        if key.startswith("action_"):
+                            # Drop actions with no requests left inside their window
+                            limit_config = self._get_limit_config(user_data, key[len("action_"):])
+                            if not self._get_window(value, limit_config["period_seconds"], now_ms):
                                 cleaned_count += 1
-                        except ValueError:
-                            pass
+                                continue
+                        elif key == "blocked_until" and not self._is_blocked(user_data, now):
+                            # Drop expired blocks
+                            cleaned_count += 1
+                            continue
+                        kept[key] = value
                     
-                    # Remove empty user entries
-                    if not user_data or (len(user_data) == 1 and "custom_limits" in user_data and not user_data["custom_limits"]):
-                        del data[user_key]
+                    # Drop empty user entries
+                    if not kept or kept == {"custom_limits": {}}:
                         cleaned_count += 1
+                        continue
+                    new_data[user_key] = kept
                 
                 if cleaned_count > 0:
-                    await self._write_data(data)
+                    self._data = new_data
+                    self._write_data()
                     logger.info(f"Cleaned up {cleaned_count} expired rate limit entries")
                 
                 return cleaned_count
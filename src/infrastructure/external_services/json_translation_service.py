@@ -1,41 +1,177 @@
-import json
 import asyncio
+import os
+import threading
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Mapping, Set
 import logging
-import re
+import orjson
 
 from ...application.interfaces.translation_service import TranslationService
 from ...shared.exceptions import TranslationError
 from ...shared.config.settings import Settings
+from ...shared.utils import atomic_write_bytes, DebouncedFlush
 
 logger = logging.getLogger(__name__)
 
+# Built once at import; only read when creating missing locale files
+_DEFAULT_TRANSLATIONS: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "en": {
+        # Bot commands
+        "start": "🎉 Welcome to MultisaveX!\n\nI can help you download media from Instagram and TikTok. Just send me a link!",
+        "help": "📖 **How to use MultisaveX:**\n\n• Send me an Instagram or TikTok link\n• I'll download and send you the media\n• Use /language to change language\n• Use /stats for your statistics",
+        "language_changed": "✅ Language changed to English",
+        "language_select": "🌍 **Select your language:**",
+        
+        # Download messages
+        "processing": "⏳ Processing your request...",
+        "downloading": "📥 Downloading media...",
+        "download_success": "✅ Download completed! Sending files...",
+        "download_failed": "❌ Failed to download media: {error}",
+        "unsupported_url": "❌ This URL is not supported. Please send an Instagram or TikTok link.",
+        "private_content": "🔒 This content is private or requires login.",
+        "rate_limited": "⏰ You're doing that too fast. Please wait {time} before trying again.",
+        "file_too_large": "📦 File is too large to send (max: {max_size}MB)",
+        
+        # User stats
+        "user_stats": "📊 **Your Statistics:**\n\n👤 Downloads: {download_count}\n📅 Member since: {join_date}\n🌍 Language: {language}",
+        
+        # Admin commands
+        "admin_help": "🔧 **Admin Commands:**\n\n/stats - System statistics\n/users - User management\n/broadcast - Send broadcast message\n/ban - Ban user\n/unban - Unban user",
+        "system_stats": "📊 **System Statistics:**\n\n👥 Total users: {total_users}\n📥 Total downloads: {total_downloads}\n📈 Active users (30d): {active_users}\n🚫 Banned users: {banned_users}",
+        "user_banned": "🚫 User {user_id} has been banned.",
+        "user_unbanned": "✅ User {user_id} has been unbanned.",
+        "broadcast_sent": "📢 Broadcast message sent to {count} users.",
+        
+        # Errors
+        "error_occurred": "❌ An error occurred. Please try again later.",
+        "not_authorized": "🔒 You are not authorized to use this command.",
+        "user_banned_message": "🚫 You have been banned from using this bot.",
+        
+        # Buttons
+        "button_download": "📥 Download",
+        "button_cancel": "❌ Cancel",
+        "button_retry": "🔄 Retry",
+    },
+    "ru": {
+        # Bot commands
+        "start": "🎉 Добро пожаловать в MultisaveX!\n\nЯ могу помочь вам скачать медиа из Instagram и TikTok. Просто отправьте мне ссылку!",
+        "help": "📖 **Как использовать MultisaveX:**\n\n• Отправьте мне ссылку на Instagram или TikTok\n• Я скачаю и отправлю вам медиа\n• Используйте /language для смены языка\n• Используйте /stats для статистики",
+        "language_changed": "✅ Язык изменен на русский",
+        "language_select": "🌍 **Выберите ваш язык:**",
+        
+        # Download messages
+        "processing": "⏳ Обрабатываю ваш запрос...",
+        "downloading": "📥 Скачиваю медиа...",
+        "download_success": "✅ Скачивание завершено! Отправляю файлы...",
+        "download_failed": "❌ Не удалось скачать медиа: {error}",
+        "unsupported_url": "❌ Эта ссылка не поддерживается. Пожалуйста, отправьте ссылку на Instagram или TikTok.",
+        "private_content": "🔒 Этот контент приватный или требует авторизации.",
+        "rate_limited": "⏰ Вы делаете это слишком быстро. Подождите {time} перед следующей попыткой.",
+        "file_too_large": "📦 Файл слишком большой для отправки (макс: {max_size}МБ)",
+        
+        # User stats
+        "user_stats": "📊 **Ваша статистика:**\n\n👤 Загрузок: {download_count}\n📅 Участник с: {join_date}\n🌍 Язык: {language}",
+        
+        # Admin commands
+        "admin_help": "🔧 **Команды администратора:**\n\n/stats - Системная статистика\n/users - Управление пользователями\n/broadcast - Рассылка\n/ban - Заблокировать пользователя\n/unban - Разблокировать пользователя",
+        "system_stats": "📊 **Системная статистика:**\n\n👥 Всего пользователей: {total_users}\n📥 Всего загрузок: {total_downloads}\n📈 Активных пользователей (30д): {active_users}\n🚫 Заблокированных: {banned_users}",
+        "user_banned": "🚫 Пользователь {user_id} заблокирован.",
+        "user_unbanned": "✅ Пользователь {user_id} разблокирован.",
+        "broadcast_sent": "📢 Сообщение разослано {count} пользователям.",
+        
+        # Errors
+        "error_occurred": "❌ Произошла ошибка. Попробуйте позже.",
+        "not_authorized": "🔒 У вас нет прав для использования этой команды.",
+        "user_banned_message": "🚫 Вы заблокированы в этом боте.",
+        
+        # Buttons
+        "button_download": "📥 Скачать",
+        "button_cancel": "❌ Отмена",
+        "button_retry": "🔄 Повторить",
+    },
+    "uz": {
+        # Bot commands
+        "start": "🎉 MultisaveX botiga xush kelibsiz!\n\nMen sizga Instagram va TikTok'dan media yuklab olishda yordam bera olaman. Shunchaki menga havola yuboring!",
+        "help": "📖 **MultisaveX'dan qanday foydalanish:**\n\n• Menga Instagram yoki TikTok havolasini yuboring\n• Men mediani yuklab olib, sizga yuboraman\n• Tilni o'zgartirish uchun /language ni ishlating\n• Statistika uchun /stats ni ishlating",
+        "language_changed": "✅ Til o'zbek tiliga o'zgartirildi",
+        "language_select": "🌍 **Tilingizni tanlang:**",
+        
+        # Download messages
+        "processing": "⏳ So'rovingizni qayta ishlamoqdaman...",
+        "downloading": "📥 Media yuklamoqdaman...",
+        "download_success": "✅ Yuklash yakunlandi! Fayllarni yubormoqdaman...",
+        "download_failed": "❌ Mediani yuklab olmadim: {error}",
+        "unsupported_url": "❌ Bu havola qo'llab-quvvatlanmaydi. Iltimos, Instagram yoki TikTok havolasini yuboring.",
+        "private_content": "🔒 Bu kontent shaxsiy yoki kirish talab qiladi.",
+        "rate_limited": "⏰ Siz buni juda tez qilyapsiz. Iltimos, {time} kuting.",
+        "file_too_large": "📦 Fayl yuborish uchun juda katta (maks: {max_size}MB)",
+        
+        # User stats
+        "user_stats": "📊 **Sizning statistikangiz:**\n\n👤 Yuklamalar: {download_count}\n📅 A'zo bo'lgan sana: {join_date}\n🌍 Til: {language}",
+        
+        # Admin commands
+        "admin_help": "🔧 **Admin buyruqlari:**\n\n/stats - Tizim statistikasi\n/users - Foydalanuvchilarni boshqarish\n/broadcast - Umumiy xabar yuborish\n/ban - Foydalanuvchini bloklash\n/unban - Foydalanuvchini blokdan chiqarish",
+        "system_stats": "📊 **Tizim statistikasi:**\n\n👥 Jami foydalanuvchilar: {total_users}\n📥 Jami yuklamalar: {total_downloads}\n📈 Faol foydalanuvchilar (30k): {active_users}\n🚫 Bloklangan: {banned_users}",
+        "user_banned": "🚫 Foydalanuvchi {user_id} bloklandi.",
+        "user_unbanned": "✅ Foydalanuvchi {user_id} blokdan chiqarildi.",
+        "broadcast_sent": "📢 Xabar {count} foydalanuvchiga yuborildi.",
+        
+        # Errors
+        "error_occurred": "❌ Xatolik yuz berdi. Keyinroq qayta urinib ko'ring.",
+        "not_authorized": "🔒 Sizda bu buyruqni ishlatish huquqi yo'q.",
+        "user_banned_message": "🚫 Siz ushbu botda bloklangansiez.",
+        
+        # Buttons
+        "button_download": "📥 Yuklash",
+        "button_cancel": "❌ Bekor qilish",
+        "button_retry": "🔄 Qayta urinish",
+    }
+})
+
+_LANGUAGE_NAMES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "en": {"en": "English", "ru": "Russian", "uz": "Uzbek"},
+    "ru": {"en": "Английский", "ru": "Русский", "uz": "Узбекский"},
+    "uz": {"en": "Inglizcha", "ru": "Ruscha", "uz": "O'zbekcha"}
+})
+
+# Constant-time membership checks; Settings keeps the ordered list
+_SUPPORTED_LANGUAGES = frozenset(Settings.SUPPORTED_LANGUAGES)
+
+# Letters found in Uzbek Cyrillic but not in Russian
+_UZ_CHARS = frozenset("ўқғҳЎҚҒҲ")
+
 
 class JsonTranslationService(TranslationService):
     """JSON-based translation service implementation"""
     
-    def __init__(self, locales_dir: str):
+    def __init__(self, locales_dir: str, flush_delay: float = 0.2):
         self.locales_dir = Path(locales_dir)
-        self._translations: Dict[str, Dict[str, str]] = {}
-        self._lock = asyncio.Lock()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, asyncio.Task] = {}
+        
+        # Added translations are written back after flush_delay, one file write per language
+        self._dirty_languages: Set[str] = set()
+        self._flusher = DebouncedFlush(self._write_languages, flush_delay)
         self._ensure_locales_exist()
+        
+        # Read-only snapshot of every language, replaced as a whole on reload/add so reads never lock
+        self._translations: Mapping[str, Mapping[str, str]] = MappingProxyType(self._load_all_sync())
     
     def _ensure_locales_exist(self):
         """Ensure locales directory and default translation files exist"""
         try:
-            self.locales_dir.mkdir(parents=True, exist_ok=True)
+            # One directory listing instead of an exists() check per language file
+            try:
+                existing = set(os.listdir(self.locales_dir))
+            except FileNotFoundError:
+                self.locales_dir.mkdir(parents=True, exist_ok=True)
+                existing = set()
             
-            # Create default English translations if not exist
-            en_file = self.locales_dir / "en.json"
-            if not en_file.exists():
-                self._create_default_translations(en_file, "en")
-            
-            # Create other language files if they don't exist
-            for lang in Settings.SUPPORTED_LANGUAGES:
-                lang_file = self.locales_dir / f"{lang}.json"
-                if not lang_file.exists():
-                    self._create_default_translations(lang_file, lang)
+            # Create default files for English and every other supported language that is missing
+            for lang in dict.fromkeys(["en", *Settings.SUPPORTED_LANGUAGES]):
+                if f"{lang}.json" not in existing:
+                    self._create_default_translations(self.locales_dir / f"{lang}.json", lang)
                     
         except Exception as e:
             logger.error(f"Failed to ensure locales exist: {e}")
@@ -46,129 +182,37 @@ class JsonTranslationService(TranslationService):
         default_translations = self._get_default_translations(language)
         
         try:
-            content = json.dumps(default_translations, indent=2, ensure_ascii=False)
-            file_path.write_text(content, encoding="utf-8")
+            file_path.write_bytes(orjson.dumps(default_translations, option=orjson.OPT_INDENT_2))
             logger.info(f"Created default translations for {language}")
         except Exception as e:
             logger.error(f"Failed to create default translations for {language}: {e}")
     
     def _get_default_translations(self, language: str) -> Dict[str, str]:
         """Get default translations for a language"""
-        translations = {
-            "en": {
-                # Bot commands
-                "start": "🎉 Welcome to MultisaveX!\n\nI can help you download media from Instagram and TikTok. Just send me a link!",
-                "help": "📖 **How to use MultisaveX:**\n\n• Send me an Instagram or TikTok link\n• I'll download and send you the media\n• Use /language to change language\n• Use /stats for your statistics",
-                "language_changed": "✅ Language changed to English",
-                "language_select": "🌍 **Select your language:**",
-                
-                # Download messages
-                "processing": "⏳ Processing your request...",
-                "downloading": "📥 Downloading media...",
-                "download_success": "✅ Download completed! Sending files...",
-                "download_failed": "❌ Failed to download media: {error}",
-                "unsupported_url": "❌ This URL is not supported. Please send an Instagram or TikTok link.",
-                "private_content": "🔒 This content is private or requires login.",
-                "rate_limited": "⏰ You're doing that too fast. Please wait {time} before trying again.",
-                "file_too_large": "📦 File is too large to send (max: {max_size}MB)",
-                
-                # User stats
-                "user_stats": "📊 **Your Statistics:**\n\n👤 Downloads: {download_count}\n📅 Member since: {join_date}\n🌍 Language: {language}",
-                
-                # Admin commands
-                "admin_help": "🔧 **Admin Commands:**\n\n/stats - System statistics\n/users - User management\n/broadcast - Send broadcast message\n/ban - Ban user\n/unban - Unban user",
-                "system_stats": "📊 **System Statistics:**\n\n👥 Total users: {total_users}\n📥 Total downloads: {total_downloads}\n📈 Active users (30d): {active_users}\n🚫 Banned users: {banned_users}",
-                "user_banned": "🚫 User {user_id} has been banned.",
-                "user_unbanned": "✅ User {user_id} has been unbanned.",
-                "broadcast_sent": "📢 Broadcast message sent to {count} users.",
-                
-                # Errors
-                "error_occurred": "❌ An error occurred. Please try again later.",
-                "not_authorized": "🔒 You are not authorized to use this command.",
-                "user_banned_message": "🚫 You have been banned from using this bot.",
-                
-                # Buttons
-                "button_download": "📥 Download",
-                "button_cancel": "❌ Cancel",
-                "button_retry": "🔄 Retry",
-            },
-            "ru": {
-                # Bot commands
-                "start": "🎉 Добро пожаловать в MultisaveX!\n\nЯ могу помочь вам скачать медиа из Instagram и TikTok. Просто отправьте мне ссылку!",
-                "help": "📖 **Как использовать MultisaveX:**\n\n• Отправьте мне ссылку на Instagram или TikTok\n• Я скачаю и отправлю вам медиа\n• Используйте /language для смены языка\n• Используйте /stats для статистики",
-                "language_changed": "✅ Язык изменен на русский",
-                "language_select": "🌍 **Выберите ваш язык:**",
-                
-                # Download messages
-                "processing": "⏳ Обрабатываю ваш запрос...",
-                "downloading": "📥 Скачиваю медиа...",
-                "download_success": "✅ Скачивание завершено! Отправляю файлы...",
-                "download_failed": "❌ Не удалось скачать медиа: {error}",
-                "unsupported_url": "❌ Эта ссылка не поддерживается. Пожалуйста, отправьте ссылку на Instagram или TikTok.",
-                "private_content": "🔒 Этот контент приватный или требует авторизации.",
-                "rate_limited": "⏰ Вы делаете это слишком быстро. Подождите {time} перед следующей попыткой.",
-                "file_too_large": "📦 Файл слишком большой для отправки (макс: {max_size}МБ)",
-                
-                # User stats
-                "user_stats": "📊 **Ваша статистика:**\n\n👤 Загрузок: {download_count}\n📅 Участник с: {join_date}\n🌍 Язык: {language}",
-                
-                # Admin commands
-                "admin_help": "🔧 **Команды администратора:**\n\n/stats - Системная статистика\n/users - Управление пользователями\n/broadcast - Рассылка\n/ban - Заблокировать пользователя\n/unban - Разблокировать пользователя",
-                "system_stats": "📊 **Системная статистика:**\n\n👥 Всего пользователей: {total_users}\n📥 Всего загрузок: {total_downloads}\n📈 Активных пользователей (30д): {active_users}\n🚫 Заблокированных: {banned_users}",
-                "user_banned": "🚫 Пользователь {user_id} заблокирован.",
-                "user_unbanned": "✅ Пользователь {user_id} разблокирован.",
-                "broadcast_sent": "📢 Сообщение разослано {count} пользователям.",
-                
-                # Errors
-                "error_occurred": "❌ Произошла ошибка. Попробуйте позже.",
-                "not_authorized": "🔒 У вас нет прав для использования этой команды.",
-                "user_banned_message": "🚫 Вы заблокированы в этом боте.",
-                
-                # Buttons
-                "button_download": "📥 Скачать",
-                "button_cancel": "❌ Отмена",
-                "button_retry": "🔄 Повторить",
-            },
-            "uz": {
-                # Bot commands
-                "start": "🎉 MultisaveX botiga xush kelibsiz!\n\nMen sizga Instagram va TikTok'dan media yuklab olishda yordam bera olaman. Shunchaki menga havola yuboring!",
-                "help": "📖 **MultisaveX'dan qanday foydalanish:**\n\n• Menga Instagram yoki TikTok havolasini yuboring\n• Men mediani yuklab olib, sizga yuboraman\n• Tilni o'zgartirish uchun /language ni ishlating\n• Statistika uchun /stats ni ishlating",
-                "language_changed": "✅ Til o'zbek tiliga o'zgartirildi",
-                "language_select": "🌍 **Tilingizni tanlang:**",
-                
-                # Download messages
-                "processing": "⏳ So'rovingizni qayta ishlamoqdaman...",
-                "downloading": "📥 Media yuklamoqdaman...",
-                "download_success": "✅ Yuklash yakunlandi! Fayllarni yubormoqdaman...",
-                "download_failed": "❌ Mediani yuklab olmadim: {error}",
-                "unsupported_url": "❌ Bu havola qo'llab-quvvatlanmaydi. Iltimos, Instagram yoki TikTok havolasini yuboring.",
-                "private_content": "🔒 Bu kontent shaxsiy yoki kirish talab qiladi.",
-                "rate_limited": "⏰ Siz buni juda tez qilyapsiz. Iltimos, {time} kuting.",
-                "file_too_large": "📦 Fayl yuborish uchun juda katta (maks: {max_size}MB)",
-                
-                # User stats
-                "user_stats": "📊 **Sizning statistikangiz:**\n\n👤 Yuklamalar: {download_count}\n📅 A'zo bo'lgan sana: {join_date}\n🌍 Til: {language}",
-                
-                # Admin commands
-                "admin_help": "🔧 **Admin buyruqlari:**\n\n/stats - Tizim statistikasi\n/users - Foydalanuvchilarni boshqarish\n/broadcast - Umumiy xabar yuborish\n/ban - Foydalanuvchini bloklash\n/unban - Foydalanuvchini blokdan chiqarish",
-                "system_stats": "📊 **Tizim statistikasi:**\n\n👥 Jami foydalanuvchilar: {total_users}\n📥 Jami yuklamalar: {total_downloads}\n📈 Faol foydalanuvchilar (30k): {active_users}\n🚫 Bloklangan: {banned_users}",
-                "user_banned": "🚫 Foydalanuvchi {user_id} bloklandi.",
-                "user_unbanned": "✅ Foydalanuvchi {user_id} blokdan chiqarildi.",
-                "broadcast_sent": "📢 Xabar {count} foydalanuvchiga yuborildi.",
-                
-                # Errors
-                "error_occurred": "❌ Xatolik yuz berdi. Keyinroq qayta urinib ko'ring.",
-                "not_authorized": "🔒 Sizda bu buyruqni ishlatish huquqi yo'q.",
-                "user_banned_message": "🚫 Siz ushbu botda bloklangansiez.",
-                
-                # Buttons
-                "button_download": "📥 Yuklash",
-                "button_cancel": "❌ Bekor qilish",
-                "button_retry": "🔄 Qayta urinish",
-            }
-        }
+        return _DEFAULT_TRANSLATIONS.get(language, _DEFAULT_TRANSLATIONS["en"])
+    
+    def _load_all_sync(self) -> Dict[str, Mapping[str, str]]:
+        """Read all supported languages at startup"""
+        translations = {}
+        for language in dict.fromkeys(["en", *Settings.SUPPORTED_LANGUAGES]):
+            lang_file = self.locales_dir / f"{language}.json"
+            try:
+                translations[language] = MappingProxyType(self._read_language_file(lang_file))
+            except Exception as e:
+                logger.error(f"Error loading translations for {language}: {e}")
         
-        return translations.get(language, translations["en"])
+        logger.debug(f"Loaded translations for {len(translations)} languages")
+        return translations
+    
+    def _publish(self, language: str, translations: Dict[str, str]) -> None:
+        """Swap in a new snapshot with one language's table replaced"""
+        snapshot = dict(self._translations)
+        snapshot[language] = MappingProxyType(translations)
+        self._translations = MappingProxyType(snapshot)
+    
+    def _read_language_file(self, lang_file: Path) -> Dict[str, str]:
+        """Read and parse a translation file"""
+        return orjson.loads(lang_file.read_bytes())
     
     async def _load_language(self, language: str) -> bool:
         """Load translations for a specific language"""
@@ -178,15 +222,10 @@ class JsonTranslationService(TranslationService):
                 logger.warning(f"Translation file not found for language: {language}")
                 return False
             
-            loop = asyncio.get_event_loop()
-            content = await loop.run_in_executor(
-                None,
-                lambda: lang_file.read_text(encoding="utf-8")
-            )
-            
-            translations = json.loads(content)
-            async with self._lock:
-                self._translations[language] = translations
+            # Parse in the worker thread too so large files don't stall the event loop
+            translations = await asyncio.to_thread(self._read_language_file, lang_file)
+            with self._lock:
+                self._publish(language, translations)
             
             logger.debug(f"Loaded {len(translations)} translations for language: {language}")
             return True
@@ -195,6 +234,15 @@ class JsonTranslationService(TranslationService):
             logger.error(f"Error loading translations for {language}: {e}")
             return False
     
+    async def _ensure_loaded(self, language: str) -> None:
+        """Load a missing language, letting concurrent callers share one in-flight load"""
+        task = self._loading.get(language)
+        if task is None:
+            task = asyncio.ensure_future(self._load_language(language))
+            self._loading[language] = task
+            task.add_done_callback(lambda _: self._loading.pop(language, None))
+        await task
+    
     async def get_text(
         self, 
         key: str, 
@@ -204,22 +252,24 @@ class JsonTranslationService(TranslationService):
         """Get translated text for key in specified language"""
         try:
             # Ensure language is supported
-            if language not in Settings.SUPPORTED_LANGUAGES:
+            if language not in _SUPPORTED_LANGUAGES:
                 language = Settings.DEFAULT_LANGUAGE
             
-            # Load language if not already loaded
+            # Languages are preloaded; only one that failed to load takes the slow path
             if language not in self._translations:
-                await self._load_language(language)
+                await self._ensure_loaded(language)
             
             # Get translation
-            translations = self._translations.get(language, {})
+            snapshot = self._translations
+            translations = snapshot.get(language, {})
             text = translations.get(key)
             
             # Fallback to English if not found
             if text is None and language != "en":
-                if "en" not in self._translations:
-                    await self._load_language("en")
-                text = self._translations.get("en", {}).get(key)
+                if "en" not in snapshot:
+                    await self._ensure_loaded("en")
+                    snapshot = self._translations
+                text = snapshot.get("en", {}).get(key)
             
             # Fallback to key if still not found
             if text is None:
@@ -227,9 +277,10 @@ class JsonTranslationService(TranslationService):
                 text = key
             
             # Format text with provided kwargs
-            if kwargs:
+            # Static texts (no placeholders) are returned as-is even when callers pass kwargs
+            if kwargs and "{" in text:
                 try:
-                    text = text.format(**kwargs)
+                    text = text.format_map(kwargs)
                 except KeyError as e:
                     logger.warning(f"Missing format parameter {e} for key '{key}'")
                 except Exception as e:
@@ -241,42 +292,37 @@ class JsonTranslationService(TranslationService):
             logger.error(f"Error getting translation for key '{key}': {e}")
             return key  # Return key as fallback
     
-    async def get_supported_languages(self) -> List[str]:
+    def get_supported_languages(self) -> List[str]:
         """Get list of supported language codes"""
         return Settings.SUPPORTED_LANGUAGES.copy()
     
-    async def is_language_supported(self, language: str) -> bool:
+    def is_language_supported(self, language: str) -> bool:
         """Check if language is supported"""
-        return language in Settings.SUPPORTED_LANGUAGES
+        return language in _SUPPORTED_LANGUAGES
     
-    async def get_language_name(self, language_code: str, in_language: str = "en") -> str:
+    def get_language_name(self, language_code: str, in_language: str = "en") -> str:
         """Get language name in specified language"""
-        language_names = {
-            "en": {"en": "English", "ru": "Russian", "uz": "Uzbek"},
-            "ru": {"en": "Английский", "ru": "Русский", "uz": "Узбекский"},
-            "uz": {"en": "Inglizcha", "ru": "Ruscha", "uz": "O'zbekcha"}
-        }
-        
-        names = language_names.get(in_language, language_names["en"])
+        names = _LANGUAGE_NAMES.get(in_language, _LANGUAGE_NAMES["en"])
         return names.get(language_code, language_code)
     
-    async def detect_language_from_text(self, text: str) -> Optional[str]:
+    def detect_language_from_text(self, text: str) -> Optional[str]:
         """Detect language from text (basic implementation)"""
-        # Simple detection based on character patterns
-        if re.search(r'[а-яё]', text.lower()):
-            return "ru"
-        elif re.search(r'[ўқғҳ]', text.lower()):
-            return "uz"
-        else:
-            return "en"
+        # Single pass over the code points: Uzbek-specific letters win, any other Cyrillic means Russian
+        has_cyrillic = False
+        for char in text:
+            if char in _UZ_CHARS:
+                return "uz"
+            if "\u0400" <= char <= "\u04ff":
+                has_cyrillic = True
+        return "ru" if has_cyrillic else "en"
     
     async def get_all_translations(self, language: str = "en") -> Dict[str, str]:
         """Get all translations for a language"""
         try:
             if language not in self._translations:
-                await self._load_language(language)
+                await self._ensure_loaded(language)
             
-            return self._translations.get(language, {}).copy()
+            return dict(self._translations.get(language, {}))
             
         except Exception as e:
             logger.error(f"Error getting all translations for {language}: {e}")
@@ -285,12 +331,12 @@ class JsonTranslationService(TranslationService):
     async def reload_translations(self) -> bool:
         """Reload translations from files"""
         try:
-            async with self._lock:
-                self._translations.clear()
+            # Write pending additions first so the reload does not drop them
+            await self.close()
             
-            # Reload all supported languages
-            for language in Settings.SUPPORTED_LANGUAGES:
-                await self._load_language(language)
+            # Files are read concurrently; each language is swapped in as it loads,
+            # readers keep seeing the previous table until then
+            await asyncio.gather(*(self._load_language(language) for language in Settings.SUPPORTED_LANGUAGES))
             
             logger.info("Reloaded all translations")
             return True
@@ -307,27 +353,21 @@ class JsonTranslationService(TranslationService):
     ) -> bool:
         """Add or update translation"""
         try:
-            if language not in Settings.SUPPORTED_LANGUAGES:
+            if language not in _SUPPORTED_LANGUAGES:
                 return False
             
             # Load language if not already loaded
             if language not in self._translations:
-                await self._load_language(language)
+                await self._ensure_loaded(language)
             
-            # Update translation in memory
-            async with self._lock:
-                if language not in self._translations:
-                    self._translations[language] = {}
-                self._translations[language][key] = text
+            # Update translation in memory by publishing a modified copy
+            with self._lock:
+                translations = dict(self._translations.get(language, {}))
+                translations[key] = text
+                self._publish(language, translations)
             
-            # Save to file
-            lang_file = self.locales_dir / f"{language}.json"
-            loop = asyncio.get_event_loop()
-            content = json.dumps(self._translations[language], indent=2, ensure_ascii=False)
-            await loop.run_in_executor(
-                None,
-                lambda: lang_file.write_text(content, encoding="utf-8")
-            )
+            # Save to file once the burst of additions settles
+            self._schedule_write(language)
             
             logger.debug(f"Added translation for key '{key}' in language '{language}'")
             return True
@@ -336,12 +376,45 @@ class JsonTranslationService(TranslationService):
             logger.error(f"Error adding translation for key '{key}': {e}")
             return False
     
+    def _write_language_file(self, language: str) -> None:
+        """Atomically write a language's current translations to its file"""
+        content = orjson.dumps(dict(self._translations.get(language, {})), option=orjson.OPT_INDENT_2)
+        atomic_write_bytes(self.locales_dir / f"{language}.json", content)
+    
+    def _schedule_write(self, language: str) -> None:
+        """Mark language as changed and schedule a debounced write to file"""
+        self._dirty_languages.add(language)
+        self._flusher.schedule()
+    
+    async def _write_languages(self) -> None:
+        """Write each changed language file once, keeping failed languages pending"""
+        languages, self._dirty_languages = self._dirty_languages, set()
+        failed = set()
+        for language in languages:
+            try:
+                await asyncio.to_thread(self._write_language_file, language)
+            except Exception as e:
+                logger.error(f"Error saving translations for {language}: {e}")
+                failed.add(language)
+        
+        if failed:
+            self._dirty_languages |= failed
+            raise TranslationError(f"Failed to save translations for {', '.join(sorted(failed))}")
+    
+    async def close(self) -> None:
+        """Write pending translation changes to files immediately"""
+        await self._flusher.close()
+    
     async def get_missing_translations(self, reference_language: str = "en") -> Dict[str, List[str]]:
         """Get missing translations for each language compared to reference"""
         try:
-            # Load reference language
-            if reference_language not in self._translations:
-                await self._load_language(reference_language)
+            # Load any languages that are not loaded yet, concurrently
+            not_loaded = [
+                language
+                for language in dict.fromkeys([reference_language, *Settings.SUPPORTED_LANGUAGES])
+                if language not in self._translations
+            ]
+            await asyncio.gather(*(self._ensure_loaded(language) for language in not_loaded))
             
             reference_keys = set(self._translations.get(reference_language, {}).keys())
             missing = {}
@@ -350,10 +423,6 @@ class JsonTranslationService(TranslationService):
                 if language == reference_language:
                     continue
                 
-                # Load language if not already loaded
-                if language not in self._translations:
-                    await self._load_language(language)
-                
                 language_keys = set(self._translations.get(language, {}).keys())
                 missing_keys = reference_keys - language_keys
                 
@@ -1,8 +1,10 @@
 import asyncio
 import logging
 import tempfile
+import threading
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from types import MappingProxyType
+from typing import List, Optional, Dict, Any, Tuple, Mapping
 import yt_dlp
 from urllib.parse import urlparse
 import re
@@ -16,13 +18,26 @@ from ...shared.config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# One alternation covering full video links, short links and mobile links, scanned once per URL
+_TIKTOK_URL_PATTERN = re.compile(
+    r'https?://(?:'
+    r'(?:www\.)?tiktok\.com/(?:@[\w.-]+/video/\d+|t/[\w.-]+)'
+    r'|(?:vm\.|vt\.)?tiktok\.com/[\w.-]+'
+    r'|m\.tiktok\.com/v/\d+'
+    r')'
+)
+_VIDEO_SUFFIXES = frozenset({'.mp4', '.webm', '.mkv', '.mov'})
+
 
 class TikTokDownloaderService(DownloaderService):
     """TikTok media downloader service using yt-dlp"""
     
     def __init__(self):
         self.temp_dir = Settings.TEMP_DIR
-        self._ydl_opts = self._get_ydl_options()
+        # Read-only base; per-call options are built by merging overrides into a new dict
+        self._ydl_opts: Mapping[str, Any] = MappingProxyType(self._get_ydl_options())
+        # YoutubeDL is expensive to build and not thread-safe, so each worker thread keeps its own
+        self._info_ydl_local = threading.local()
     
     def _get_ydl_options(self) -> Dict[str, Any]:
         """Get yt-dlp options"""
@@ -52,46 +67,53 @@ class TikTokDownloaderService(DownloaderService):
             }
         }
     
+    def _get_info_ydl(self) -> yt_dlp.YoutubeDL:
+        """Get this thread's long-lived YoutubeDL for info extraction"""
+        ydl = getattr(self._info_ydl_local, 'ydl', None)
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL({
+                **self._ydl_opts,
+                'skip_download': True,
+                'quiet': True,
+                'no_warnings': True
+            })
+            self._info_ydl_local.ydl = ydl
+        return ydl
+    
     async def can_handle(self, url: str) -> bool:
         """Check if service can handle the given URL"""
-        tiktok_patterns = [
-            r'https?://(?:www\.)?tiktok\.com/@[\w.-]+/video/\d+',
-            r'https?://(?:vm\.|vt\.)?tiktok\.com/[\w.-]+',
-            r'https?://(?:www\.)?tiktok\.com/t/[\w.-]+',
-            r'https?://m\.tiktok\.com/v/\d+',
-        ]
-        
-        return any(re.match(pattern, url) for pattern in tiktok_patterns)
+        return self.supports(url)
+    
+    def supports(self, url: str) -> Optional[bool]:
+        """Synchronously check URL against supported patterns"""
+        # Every pattern contains the domain; a substring test rejects other URLs before the regex runs
+        if 'tiktok.com' not in url:
+            return False
+        return _TIKTOK_URL_PATTERN.match(url) is not None
     
     async def extract_media_info(self, url: str) -> Dict[str, Any]:
         """Extract media information from URL without downloading"""
         try:
-            if not await self.can_handle(url):
+            if not self.supports(url):
                 raise UnsupportedUrlError(f"URL not supported: {url}")
             
-            # Configure yt-dlp for info extraction only
-            info_opts = self._ydl_opts.copy()
-            info_opts.update({
-                'skip_download': True,
-                'quiet': True,
-                'no_warnings': True
-            })
-            
-            loop = asyncio.get_event_loop()
-            
             def extract_info():
-                with yt_dlp.YoutubeDL(info_opts) as ydl:
-                    return ydl.extract_info(url, download=False)
+                return self._get_info_ydl().extract_info(url, download=False)
             
-            info = await loop.run_in_executor(None, extract_info)
+            info = await asyncio.to_thread(extract_info)
             
             if not info:
                 raise DownloadError("Could not extract video information")
             
+            # yt-dlp may report these as None; strip() and slicing return the same
+            # object when there is nothing to trim, so clean values are not copied
+            title = info.get("title") or ""
+            description = info.get("description") or ""
+            
             media_info = {
                 "id": info.get("id"),
-                "title": info.get("title", "").strip(),
-                "description": info.get("description", "").strip()[:500],
+                "title": title.strip(),
+                "description": description.strip()[:500],
                 "uploader": info.get("uploader"),
                 "uploader_id": info.get("uploader_id"),
                 "duration": info.get("duration"),
@@ -126,51 +148,53 @@ class TikTokDownloaderService(DownloaderService):
     async def download_media(self, request: DownloadRequest) -> List[str]:
         """Download media from TikTok URL"""
         try:
-            # Create unique temp directory for this request
-            temp_dir = self.temp_dir / f"tiktok_{request.id}"
-            temp_dir.mkdir(exist_ok=True)
-            
-            # Configure download options
-            download_opts = self._ydl_opts.copy()
-            download_opts.update({
-                'outtmpl': str(temp_dir / 'tiktok_%(id)s.%(ext)s'),
-                'max_filesize': Settings.MAX_FILE_SIZE * 1024 * 1024,  # Convert MB to bytes
-            })
+            # yt-dlp reports each finished file with its size, so the temp dir is never scanned
+            finished: List[Tuple[str, Optional[int]]] = []
+            
+            def on_progress(status: Dict[str, Any]):
+                if status.get('status') == 'finished':
+                    finished.append((status['filename'], status.get('total_bytes') or status.get('downloaded_bytes')))
+            
+            # Configure download options; files share the temp dir and are kept apart by a
+            # per-request filename prefix, so no directory is created or removed per download
+            download_opts = {
+                **self._ydl_opts,
+                'outtmpl': str(self.temp_dir / f'tiktok_{request.id}_%(id)s.%(ext)s'),
+                'max_filesize': Settings.MAX_FILE_SIZE_BYTES,
+                'progress_hooks': [on_progress],
+            }
             
-            loop = asyncio.get_event_loop()
             downloaded_files = []
             
             def download():
                 with yt_dlp.YoutubeDL(download_opts) as ydl:
-                    # Get info first to check file size
-                    info = ydl.extract_info(request.url, download=False)
-                    
-                    if info and info.get('filesize'):
-                        filesize = info['filesize']
-                        max_size = Settings.MAX_FILE_SIZE * 1024 * 1024
-                        if filesize > max_size:
-                            raise DownloadError(f"File size ({filesize} bytes) exceeds limit ({max_size} bytes)")
-                    
-                    # Download the video
-                    ydl.download([request.url])
+                    # Single extraction; yt-dlp skips formats over max_filesize before downloading
+                    info = ydl.extract_info(request.url, download=True)
+                
+                if not finished and info:
+                    # A skipped oversized file leaves nothing finished; report it as such
+                    filesize = info.get('filesize') or info.get('filesize_approx')
+                    if filesize and filesize > Settings.MAX_FILE_SIZE_BYTES:
+                        raise DownloadError(f"File size ({filesize} bytes) exceeds limit ({Settings.MAX_FILE_SIZE_BYTES} bytes)")
+                
+                files = []
+                for file_path, file_size in finished:
+                    if os.path.splitext(file_path)[1].lower() not in _VIDEO_SUFFIXES:
+                        continue
                     
-                    # Find downloaded files
-                    files = []
-                    for file_path in temp_dir.glob("*"):
-                        if file_path.is_file() and file_path.suffix.lower() in ['.mp4', '.webm', '.mkv', '.mov']:
-                            # Double-check file size
-                            file_size = file_path.stat().st_size
-                            max_size = Settings.MAX_FILE_SIZE * 1024 * 1024
-                            
-                            if file_size <= max_size:
-                                files.append(str(file_path))
-                            else:
-                                logger.warning(f"Downloaded file {file_path} exceeds size limit: {file_size} bytes")
-                                file_path.unlink()  # Remove oversized file
+                    # Double-check file size
+                    if file_size is None:
+                        file_size = os.path.getsize(file_path)
                     
-                    return files
+                    if file_size <= Settings.MAX_FILE_SIZE_BYTES:
+                        files.append(file_path)
+                    else:
+                        logger.warning(f"Downloaded file {file_path} exceeds size limit: {file_size} bytes")
+                        os.unlink(file_path)  # Remove oversized file
+                
+                return files
             
-            downloaded_files = await loop.run_in_executor(None, download)
+            downloaded_files = await asyncio.to_thread(download)
             
             if not downloaded_files:
                 raise DownloadError("No video files were downloaded or all files exceed size limit")
@@ -216,19 +240,8 @@ class TikTokDownloaderService(DownloaderService):
         """Clean up temporary files"""
         try:
             for file_path in file_paths:
-                path = Path(file_path)
-                if path.exists():
-                    # Remove file
-                    path.unlink()
-                    
-                    # Try to remove parent directory if empty
-                    try:
-                        parent = path.parent
-                        if parent.exists() and not any(parent.iterdir()):
-                            parent.rmdir()
-                    except Exception:
-                        pass  # Ignore cleanup errors for directories
-                        
+                Path(file_path).unlink(missing_ok=True)
+            
             logger.debug(f"Cleaned up {len(file_paths)} temporary files")
         except Exception as e:
             logger.error(f"Error cleaning up temporary files: {e}") 
\ No newline at end of file
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional
+from datetime import datetime
+
+from ...domain.entities.analytics import Analytics
+from ...domain.repositories.analytics_repository import AnalyticsRepository
+
+logger = logging.getLogger(__name__)
+
+# Queue marker telling the background writer to flush and exit
+_STOP = object()
+
+
+class BufferedAnalyticsRepository(AnalyticsRepository):
+    """
+    Analytics repository decorator that queues writes and saves them in
+    batches from a background task, keeping analytics off the request path.
+    
+    Queued records become visible to reads once their batch is flushed,
+    at most flush_interval seconds after being saved.
+    """
+    
+    def __init__(self, repository: AnalyticsRepository, batch_size: int = 100, flush_interval: float = 5.0):
+        self._repository = repository
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._writer: Optional[asyncio.Task] = None
+    
+    def _ensure_writer(self) -> None:
+        """Start background writer if it is not running"""
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._run_writer())
+    
+    async def _run_writer(self) -> None:
+        """Drain queue in batches, flushing when a batch is full or old enough"""
+        loop = asyncio.get_running_loop()
+        while True:
+            record = await self._queue.get()
+            if record is _STOP:
+                return
+            
+            batch = [record]
+            stopping = False
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    record = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if record is _STOP:
+                    stopping = True
+                    break
+                batch.append(record)
+            
+            await self._write_batch(batch)
+            if stopping:
+                return
+    
+    async def _write_batch(self, batch: List[Analytics]) -> None:
+        """Write batch to the wrapped repository, logging instead of raising"""
+        try:
+            await self._repository.save_many(batch)
+            logger.debug(f"Flushed {len(batch)} analytics records")
+        except Exception as e:
+            logger.error(f"Failed to flush {len(batch)} analytics records: {e}")
+    
+    async def close(self) -> None:
+        """Flush queued records and stop the background writer"""
+        if self._writer is None or self._writer.done():
+            return
+        self._queue.put_nowait(_STOP)
+        await self._writer
+        self._writer = None
+    
+    async def save(self, analytics: Analytics) -> Analytics:
+        """Queue analytics record for saving"""
+        self._ensure_writer()
+        self._queue.put_nowait(analytics)
+        return analytics
+    
+    async def save_many(self, records: List[Analytics]) -> List[Analytics]:
+        """Queue several analytics records for saving"""
+        self._ensure_writer()
+        for analytics in records:
+            self._queue.put_nowait(analytics)
+        return records
+    
+    async def get_by_user_id(self, user_id: int, days: int = 30) -> List[Analytics]:
+        """Get analytics for a specific user"""
+        return await self._repository.get_by_user_id(user_id, days)
+    
+    async def get_platform_stats(self, platform: str, days: Optional[int] = 30) -> Dict[str, Any]:
+        """Get platform-specific statistics for the last days, or all time if days is None"""
+        return await self._repository.get_platform_stats(platform, days)
+    
+    async def get_daily_stats(self, days: int = 30) -> Dict[str, Any]:
+        """Get daily usage statistics"""
+        return await self._repository.get_daily_stats(days)
+    
+    async def get_total_downloads(self) -> int:
+        """Get total download count"""
+        return await self._repository.get_total_downloads()
+    
+    async def get_error_summary(self) -> Dict[str, Any]:
+        """Get total download count together with failures grouped by error"""
+        return await self._repository.get_error_summary()
+    
+    async def get_downloads_by_date_range(
+        self, start_date: datetime, end_date: datetime
+    ) -> List[Analytics]:
+        """Get downloads within date range"""
+        return await self._repository.get_downloads_by_date_range(start_date, end_date)
+    
+    async def get_top_users(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get top users by download count"""
+        return await self._repository.get_top_users(limit)
+    
+    async def cleanup_old_records(self, days: int = 90) -> int:
+        """Delete records older than specified days and return how many were deleted"""
+        return await self._repository.cleanup_old_records(days)
@@ -1,63 +1,62 @@
-import json
 import asyncio
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import logging
-from collections import defaultdict
+from collections import defaultdict, Counter
 
 from ...domain.entities.analytics import Analytics, AnalyticsEventType
 from ...domain.repositories.analytics_repository import AnalyticsRepository
 from ...shared.exceptions import RepositoryError
+from ...shared.utils import atomic_write_bytes, to_json_lines, read_json_lines, append_json_lines, prepare_json_lines_file
 
 logger = logging.getLogger(__name__)
 
+_DOWNLOAD_EVENT_NAMES = frozenset({"download_success", "download_failed"})
+
 
 class JsonAnalyticsRepository(AnalyticsRepository):
-    """JSON-based analytics repository implementation"""
+    """
+    JSON-based analytics repository implementation
+    
+    Records are stored one JSON object per line, so saving appends to the
+    file instead of rewriting it.
+    
+    Records are also kept in memory alongside parallel columns of the
+    fields queries filter on, with timestamps parsed once at load/save into
+    epoch seconds, so statistics compare plain floats instead of re-reading
+    and re-parsing rows. Per-day download aggregates are maintained as
+    records arrive, so daily stats only slice the requested days.
+    """
     
     def __init__(self, file_path: Path):
         self.file_path = Path(file_path)
         self._lock = asyncio.Lock()
         self._ensure_file_exists()
+        
+        self._records: Optional[List[Dict[str, Any]]] = None
+        self._reset_columns()
     
     def _ensure_file_exists(self):
-        """Ensure the JSON file exists"""
+        """Ensure the JSON lines file exists, converting a legacy JSON array file and repairing a torn last line"""
         try:
-            self.file_path.parent.mkdir(parents=True, exist_ok=True)
-            if not self.file_path.exists():
-                self.file_path.write_text("[]", encoding="utf-8")
+            prepare_json_lines_file(self.file_path)
         except Exception as e:
             logger.error(f"Failed to ensure analytics file exists: {e}")
             raise RepositoryError(f"Failed to initialize analytics repository: {e}")
     
     async def _read_data(self) -> List[Dict[str, Any]]:
-        """Read data from JSON file"""
+        """Read data from JSON lines file"""
         try:
-            loop = asyncio.get_event_loop()
-            content = await loop.run_in_executor(
-                None, 
-                lambda: self.file_path.read_text(encoding="utf-8")
-            )
-            return json.loads(content)
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in analytics repository: {e}")
-            # Reset file if corrupted
-            await self._write_data([])
-            return []
+            return await asyncio.to_thread(read_json_lines, self.file_path)
         except Exception as e:
             logger.error(f"Error reading analytics data: {e}")
             raise RepositoryError(f"Failed to read analytics data: {e}")
     
-    async def _write_data(self, data: List[Dict[str, Any]]):
-        """Write data to JSON file"""
+    async def _append_data(self, data: List[Dict[str, Any]]):
+        """Append records to JSON lines file"""
         try:
-            loop = asyncio.get_event_loop()
-            content = json.dumps(data, indent=2, default=str, ensure_ascii=False)
-            await loop.run_in_executor(
-                None,
-                lambda: self.file_path.write_text(content, encoding="utf-8")
-            )
+            await asyncio.to_thread(append_json_lines, self.file_path, to_json_lines(data))
         except Exception as e:
             logger.error(f"Error writing analytics data: {e}")
             raise RepositoryError(f"Failed to write analytics data: {e}")
@@ -67,7 +66,7 @@ class JsonAnalyticsRepository(AnalyticsRepository):
         return {
             "id": analytics.id,
             "user_id": analytics.user_id,
-            "event_type": analytics.event_type.value,
+            "event_type": analytics.get_event_type_name(),
             "platform": analytics.platform,
             "media_type": analytics.media_type,
             "url": analytics.url,
@@ -92,47 +91,126 @@ class JsonAnalyticsRepository(AnalyticsRepository):
             processing_time=data.get("processing_time"),
             success=data.get("success", True),
             error_message=data.get("error_message"),
-            metadata=data.get("metadata", {}),
+            metadata=data.get("metadata") or None,
             created_at=datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
         )
     
+    async def _get_records(self) -> List[Dict[str, Any]]:
+        """Get in-memory records, loading them from file on first use"""
+        if self._records is None:
+            async with self._lock:
+                if self._records is None:
+                    data = await self._read_data()
+                    for record in data:
+                        self._add_columns(record)
+                    self._records = data
+        return self._records
+    
+    def _reset_columns(self) -> None:
+        """Clear the in-memory columns and aggregates"""
+        self._user_ids: List[int] = []
+        self._event_types: List[Optional[str]] = []
+        self._platforms: List[Optional[str]] = []
+        self._timestamps: List[Optional[float]] = []
+        self._daily: Dict[str, Dict[str, Any]] = {}
+        self._success_counts: Counter = Counter()
+    
+    def _add_columns(self, record: Dict[str, Any]) -> None:
+        """Append a record's query fields to the in-memory columns"""
+        ts = datetime.fromisoformat(record["created_at"]).timestamp() if record.get("created_at") else None
+        self._user_ids.append(record["user_id"])
+        self._event_types.append(record.get("event_type"))
+        self._platforms.append(record.get("platform"))
+        self._timestamps.append(ts)
+        
+        if record.get("event_type") in _DOWNLOAD_EVENT_NAMES:
+            self._add_to_daily(record, ts)
+            if record["event_type"] == "download_success":
+                self._success_counts[record["user_id"]] += 1
+    
+    def _add_to_daily(self, record: Dict[str, Any], ts: Optional[float]) -> None:
+        """Count a download record in its day's aggregate"""
+        # Records without a timestamp count towards the day they were loaded or saved
+        date_key = (date.fromtimestamp(ts) if ts is not None else date.today()).isoformat()
+        
+        # Initialize date entry if it doesn't exist
+        day = self._daily.get(date_key)
+        if day is None:
+            day = self._daily[date_key] = {
+                "downloads": 0,
+                "successful": 0,
+                "failed": 0,
+                "unique_users": set(),
+                "platforms": {}
+            }
+        
+        day["downloads"] += 1
+        day["unique_users"].add(record["user_id"])
+        
+        if record.get("event_type") == "download_success":
+            day["successful"] += 1
+        else:
+            day["failed"] += 1
+        
+        platform = record.get("platform")
+        if platform:
+            day["platforms"][platform] = day["platforms"].get(platform, 0) + 1
+    
+    def _remember(self, data: List[Dict[str, Any]]) -> None:
+        """Add saved records to memory if it has been loaded"""
+        if self._records is not None:
+            self._records.extend(data)
+            for record in data:
+                self._add_columns(record)
+    
     async def save(self, analytics: Analytics) -> Analytics:
         """Save analytics record"""
         async with self._lock:
             try:
-                data = await self._read_data()
                 analytics_dict = self._analytics_to_dict(analytics)
-                data.append(analytics_dict)
-                await self._write_data(data)
+                await self._append_data([analytics_dict])
+                self._remember([analytics_dict])
                 logger.debug(f"Saved analytics record {analytics.id}")
                 return analytics
             except Exception as e:
                 logger.error(f"Error saving analytics {analytics.id}: {e}")
                 raise RepositoryError(f"Failed to save analytics: {e}")
     
+    async def save_many(self, records: List[Analytics]) -> List[Analytics]:
+        """Save several analytics records at once"""
+        async with self._lock:
+            try:
+                data = [self._analytics_to_dict(analytics) for analytics in records]
+                await self._append_data(data)
+                self._remember(data)
+                logger.debug(f"Saved {len(records)} analytics records")
+                return records
+            except Exception as e:
+                logger.error(f"Error saving {len(records)} analytics records: {e}")
+                raise RepositoryError(f"Failed to save analytics records: {e}")
+    
     async def get_by_user_id(self, user_id: int, days: int = 30) -> List[Analytics]:
         """Get analytics for a specific user"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            data = await self._read_data()
+            cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp()
+            records = await self._get_records()
             user_analytics = []
             
-            for record in data:
-                if record["user_id"] == user_id:
-                    created_at = datetime.fromisoformat(record["created_at"]) if record.get("created_at") else datetime.now()
-                    if created_at >= cutoff_date:
-                        user_analytics.append(self._dict_to_analytics(record))
+            # Records without a timestamp count as current
+            for i, (record_user_id, ts) in enumerate(zip(self._user_ids, self._timestamps)):
+                if record_user_id == user_id and (ts is None or ts >= cutoff_ts):
+                    user_analytics.append(self._dict_to_analytics(records[i]))
             
             return user_analytics
         except Exception as e:
             logger.error(f"Error getting analytics for user {user_id}: {e}")
             raise RepositoryError(f"Failed to get user analytics: {e}")
     
-    async def get_platform_stats(self, platform: str, days: int = 30) -> Dict[str, Any]:
-        """Get platform-specific statistics"""
+    async def get_platform_stats(self, platform: str, days: Optional[int] = 30) -> Dict[str, Any]:
+        """Get platform-specific statistics for the last days, or all time if days is None"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            data = await self._read_data()
+            cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp() if days is not None else None
+            records = await self._get_records()
             
             stats = {
                 "total_downloads": 0,
@@ -146,32 +224,34 @@ class JsonAnalyticsRepository(AnalyticsRepository):
             
             processing_times = []
             
-            for record in data:
-                if record.get("platform") == platform:
-                    created_at = datetime.fromisoformat(record["created_at"]) if record.get("created_at") else datetime.now()
-                    if created_at >= cutoff_date:
-                        event_type = record.get("event_type")
-                        
-                        if event_type in ["download_success", "download_failed"]:
-                            stats["total_downloads"] += 1
-                            stats["unique_users"].add(record["user_id"])
-                            
-                            if event_type == "download_success":
-                                stats["successful_downloads"] += 1
-                                if record.get("file_size"):
-                                    stats["total_file_size"] += record["file_size"]
-                            else:
-                                stats["failed_downloads"] += 1
-                            
-                            if record.get("media_type"):
-                                stats["media_types"][record["media_type"]] += 1
-                            
-                            if record.get("processing_time"):
-                                processing_times.append(record["processing_time"])
+            columns = zip(self._platforms, self._event_types, self._timestamps, self._user_ids)
+            for i, (record_platform, event_type, ts, user_id) in enumerate(columns):
+                if record_platform != platform or event_type not in _DOWNLOAD_EVENT_NAMES:
+                    continue
+                if cutoff_ts is not None and ts is not None and ts < cutoff_ts:
+                    continue
+                
+                record = records[i]
+                stats["total_downloads"] += 1
+                stats["unique_users"].add(user_id)
+                
+                if event_type == "download_success":
+                    stats["successful_downloads"] += 1
+                    if record.get("file_size"):
+                        stats["total_file_size"] += record["file_size"]
+                else:
+                    stats["failed_downloads"] += 1
+                
+                if record.get("media_type"):
+                    stats["media_types"][record["media_type"]] += 1
+                
+                if record.get("processing_time"):
+                    processing_times.append(record["processing_time"])
             
             stats["unique_users"] = len(stats["unique_users"])
             stats["media_types"] = dict(stats["media_types"])
             stats["average_processing_time"] = sum(processing_times) / len(processing_times) if processing_times else 0
+            stats["timed_downloads"] = len(processing_times)
             stats["success_rate"] = (stats["successful_downloads"] / stats["total_downloads"]) * 100 if stats["total_downloads"] > 0 else 0
             
             return stats
@@ -182,50 +262,21 @@ class JsonAnalyticsRepository(AnalyticsRepository):
     async def get_daily_stats(self, days: int = 30) -> Dict[str, Any]:
         """Get daily usage statistics"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            data = await self._read_data()
-            
-            daily_stats: Dict[str, Dict[str, Any]] = {}
-            
-            for record in data:
-                created_at = datetime.fromisoformat(record["created_at"]) if record.get("created_at") else datetime.now()
-                if created_at >= cutoff_date:
-                    date_key = created_at.strftime("%Y-%m-%d")
-                    event_type = record.get("event_type")
-                    
-                    if event_type in ["download_success", "download_failed"]:
-                        # Initialize date entry if it doesn't exist
-                        if date_key not in daily_stats:
-                            daily_stats[date_key] = {
-                                "downloads": 0,
-                                "successful": 0,
-                                "failed": 0,
-                                "unique_users": set(),
-                                "platforms": {}
-                            }
-                        
-                        daily_stats[date_key]["downloads"] += 1
-                        daily_stats[date_key]["unique_users"].add(record["user_id"])
-                        
-                        if event_type == "download_success":
-                            daily_stats[date_key]["successful"] += 1
-                        else:
-                            daily_stats[date_key]["failed"] += 1
-                        
-                        platform = record.get("platform")
-                        if platform:
-                            platforms = daily_stats[date_key]["platforms"]
-                            platforms[platform] = platforms.get(platform, 0) + 1
+            # Whole days from the cutoff date onwards
+            cutoff_key = (datetime.now() - timedelta(days=days)).date().isoformat()
+            await self._get_records()
             
             # Convert sets to counts for final result
             result = {}
-            for date, stats in daily_stats.items():
-                result[date] = {
+            for date_key, stats in self._daily.items():
+                if date_key < cutoff_key:
+                    continue
+                result[date_key] = {
                     "downloads": stats["downloads"],
                     "successful": stats["successful"],
                     "failed": stats["failed"],
                     "unique_users": len(stats["unique_users"]),
-                    "platforms": stats["platforms"]
+                    "platforms": dict(stats["platforms"])
                 }
             
             return result
@@ -236,26 +287,47 @@ class JsonAnalyticsRepository(AnalyticsRepository):
     async def get_total_downloads(self) -> int:
         """Get total download count"""
         try:
-            data = await self._read_data()
-            return sum(1 for record in data if record.get("event_type") in ["download_success", "download_failed"])
+            await self._get_records()
+            return sum(1 for event_type in self._event_types if event_type in _DOWNLOAD_EVENT_NAMES)
         except Exception as e:
             logger.error(f"Error getting total downloads: {e}")
             raise RepositoryError(f"Failed to get total downloads: {e}")
     
+    async def get_error_summary(self) -> Dict[str, Any]:
+        """Get total download count together with failures grouped by error"""
+        try:
+            records = await self._get_records()
+            total_downloads = 0
+            errors: Dict[str, int] = defaultdict(int)
+            
+            for i, event_type in enumerate(self._event_types):
+                if event_type in _DOWNLOAD_EVENT_NAMES:
+                    total_downloads += 1
+                    if event_type == "download_failed":
+                        errors[records[i].get("error_message") or "unknown"] += 1
+            
+            return {
+                "total_downloads": total_downloads,
+                "errors": dict(errors)
+            }
+        except Exception as e:
+            logger.error(f"Error getting error summary: {e}")
+            raise RepositoryError(f"Failed to get error summary: {e}")
+    
     async def get_downloads_by_date_range(
         self, start_date: datetime, end_date: datetime
     ) -> List[Analytics]:
         """Get downloads within date range"""
         try:
-            data = await self._read_data()
+            now_ts = datetime.now().timestamp()
+            start_ts = start_date.timestamp()
+            end_ts = end_date.timestamp()
+            records = await self._get_records()
             downloads = []
             
-            for record in data:
-                created_at = datetime.fromisoformat(record["created_at"]) if record.get("created_at") else datetime.now()
-                if start_date <= created_at <= end_date:
-                    event_type = record.get("event_type")
-                    if event_type in ["download_success", "download_failed"]:
-                        downloads.append(self._dict_to_analytics(record))
+            for i, (event_type, ts) in enumerate(zip(self._event_types, self._timestamps)):
+                if event_type in _DOWNLOAD_EVENT_NAMES and start_ts <= (now_ts if ts is None else ts) <= end_ts:
+                    downloads.append(self._dict_to_analytics(records[i]))
             
             return downloads
         except Exception as e:
@@ -265,18 +337,41 @@ class JsonAnalyticsRepository(AnalyticsRepository):
     async def get_top_users(self, limit: int = 10) -> List[Dict[str, Any]]:
         """Get top users by download count"""
         try:
-            data = await self._read_data()
-            user_downloads = defaultdict(int)
-            
-            for record in data:
-                event_type = record.get("event_type")
-                if event_type == "download_success":
-                    user_downloads[record["user_id"]] += 1
+            await self._get_records()
             
-            # Sort by download count and take top users
-            top_users = sorted(user_downloads.items(), key=lambda x: x[1], reverse=True)[:limit]
+            # Counts are kept up to date on save; most_common(limit) selects with a heap
+            # instead of sorting every user
+            top_users = self._success_counts.most_common(limit)
             
             return [{"user_id": user_id, "download_count": count} for user_id, count in top_users]
         except Exception as e:
             logger.error(f"Error getting top users: {e}")
-            raise RepositoryError(f"Failed to get top users: {e}") 
\ No newline at end of file
+            raise RepositoryError(f"Failed to get top users: {e}")
+    
+    async def cleanup_old_records(self, days: int = 90) -> int:
+        """Delete records older than specified days and return how many were deleted"""
+        await self._get_records()
+        async with self._lock:
+            try:
+                cutoff_ts = (datetime.now() - timedelta(days=days)).timestamp()
+                # Records without a timestamp count as current
+                kept = [
+                    record for record, ts in zip(self._records, self._timestamps)
+                    if ts is None or ts >= cutoff_ts
+                ]
+                removed = len(self._records) - len(kept)
+                if removed == 0:
+                    return 0
+                
+                # Rewrite the file atomically, then rebuild columns and aggregates from what is left
+                await asyncio.to_thread(atomic_write_bytes, self.file_path, to_json_lines(kept))
+                self._reset_columns()
+                for record in kept:
+                    self._add_columns(record)
+                self._records = kept
+                
+                logger.info(f"Cleaned up {removed} analytics records older than {days} days")
+                return removed
+            except Exception as e:
+                logger.error(f"Error cleaning up analytics records: {e}")
+                raise RepositoryError(f"Failed to clean up analytics records: {e}")
\ No newline at end of file
@@ -1,74 +1,144 @@
-import json
 import asyncio
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set, Tuple
 from datetime import datetime, timedelta
 import logging
+from collections import defaultdict
 
 from ...domain.entities.download_request import DownloadRequest, DownloadStatus, Platform
 from ...domain.repositories.download_request_repository import DownloadRequestRepository
 from ...shared.exceptions import RepositoryError
+from ...shared.utils import atomic_write_bytes, to_json_lines, read_json_lines, append_json_lines, prepare_json_lines_file
 
 logger = logging.getLogger(__name__)
 
 
 class JsonDownloadRequestRepository(DownloadRequestRepository):
-    """JSON-based download request repository implementation"""
+    """
+    JSON-based download request repository implementation
+    
+    Requests are stored one JSON object per line. Saves and status updates
+    append the full record and the last line for an id wins; the file is
+    compacted on startup and when old requests are deleted.
+    
+    All requests are kept in memory, indexed by user and status, so reads
+    never touch the file. Lines queued while a write is in progress are
+    appended together by the next write.
+    """
     
     def __init__(self, file_path: Path):
         self.file_path = Path(file_path)
         self._lock = asyncio.Lock()
+        self._load_lock = asyncio.Lock()
         self._ensure_file_exists()
+        
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+        self._by_user: Dict[int, Set[str]] = defaultdict(set)
+        self._by_status: Dict[str, Set[str]] = defaultdict(set)
+        
+        # Serialized lines waiting to be appended, each with the future its caller awaits
+        self._pending_lines: List[Tuple[bytes, asyncio.Future]] = []
+        self._writer: Optional[asyncio.Task] = None
     
     def _ensure_file_exists(self):
-        """Ensure the JSON file exists"""
+        """Ensure the JSON lines file exists, converting a legacy JSON array file, repairing a torn last line and compacting updates"""
         try:
-            self.file_path.parent.mkdir(parents=True, exist_ok=True)
-            if not self.file_path.exists():
-                self.file_path.write_text("[]", encoding="utf-8")
+            prepare_json_lines_file(self.file_path, key="id")
         except Exception as e:
             logger.error(f"Failed to ensure download request file exists: {e}")
             raise RepositoryError(f"Failed to initialize download request repository: {e}")
     
     async def _read_data(self) -> List[Dict[str, Any]]:
-        """Read data from JSON file"""
+        """Read data from JSON lines file"""
         try:
-            loop = asyncio.get_event_loop()
-            content = await loop.run_in_executor(
-                None, 
-                lambda: self.file_path.read_text(encoding="utf-8")
-            )
-            return json.loads(content)
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in download request repository: {e}")
-            # Reset file if corrupted
-            await self._write_data([])
-            return []
+            return await asyncio.to_thread(read_json_lines, self.file_path, "id")
         except Exception as e:
             logger.error(f"Error reading download request data: {e}")
             raise RepositoryError(f"Failed to read download request data: {e}")
     
+    async def preload(self) -> None:
+        """Load requests from file into memory"""
+        await self._get_records()
+        logger.info(f"Preloaded {len(self._records)} download requests")
+    
+    async def _get_records(self) -> Dict[str, Dict[str, Any]]:
+        """Get in-memory requests by ID, loading and indexing them from file on first use"""
+        if self._records is None:
+            async with self._load_lock:
+                if self._records is None:
+                    records = {request_dict["id"]: request_dict for request_dict in await self._read_data()}
+                    for request_dict in records.values():
+                        self._index(request_dict)
+                    self._records = records
+        return self._records
+    
+    def _index(self, request_dict: Dict[str, Any]) -> None:
+        """Add request to the user and status indexes"""
+        self._by_user[request_dict["user_id"]].add(request_dict["id"])
+        self._by_status[request_dict["status"]].add(request_dict["id"])
+    
+    def _unindex(self, request_dict: Dict[str, Any]) -> None:
+        """Remove request from the user and status indexes"""
+        self._by_user[request_dict["user_id"]].discard(request_dict["id"])
+        self._by_status[request_dict["status"]].discard(request_dict["id"])
+    
+    async def _get_by_status(self, status: str) -> List[Dict[str, Any]]:
+        """Get requests with the given status from the index"""
+        records = await self._get_records()
+        return [records[request_id] for request_id in self._by_status.get(status, ())]
+    
     async def _write_data(self, data: List[Dict[str, Any]]):
-        """Write data to JSON file"""
+        """Rewrite JSON lines file with the given records"""
         try:
-            loop = asyncio.get_event_loop()
-            content = json.dumps(data, indent=2, default=str, ensure_ascii=False)
-            await loop.run_in_executor(
-                None,
-                lambda: self.file_path.write_text(content, encoding="utf-8")
-            )
+            content = to_json_lines(data)
+            await asyncio.to_thread(atomic_write_bytes, self.file_path, content)
         except Exception as e:
             logger.error(f"Error writing download request data: {e}")
             raise RepositoryError(f"Failed to write download request data: {e}")
     
+    def _queue_append(self, data: List[Dict[str, Any]]) -> asyncio.Future:
+        """Queue records for appending; the returned future resolves once they are on file"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending_lines.append((to_json_lines(data), future))
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.create_task(self._write_pending())
+        return future
+    
+    async def _write_pending(self) -> None:
+        """Append all queued lines with one write, repeating while more arrive"""
+        while self._pending_lines:
+            batch, self._pending_lines = self._pending_lines, []
+            content = b"".join(lines for lines, _ in batch)
+            
+            error = None
+            try:
+                await asyncio.to_thread(append_json_lines, self.file_path, content)
+            except Exception as e:
+                logger.error(f"Error writing download request data: {e}")
+                error = RepositoryError(f"Failed to write download request data: {e}")
+            
+            for _, future in batch:
+                # A caller cancelled while waiting has already cancelled its future
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+    
+    async def _wait_for_writes(self) -> None:
+        """Wait until queued lines have been appended"""
+        if self._writer is not None and not self._writer.done():
+            await self._writer
+    
     def _request_to_dict(self, request: DownloadRequest) -> Dict[str, Any]:
         """Convert DownloadRequest entity to dictionary"""
         return {
             "id": request.id,
             "user_id": request.user_id,
             "url": request.url,
-            "platform": request.platform.value if request.platform else None,
-            "status": request.status.value,
+            "platform": request.get_platform_name() if request.platform else None,
+            "status": request.get_status_name(),
             "created_at": request.created_at.isoformat() if request.created_at else None,
             "started_at": request.started_at.isoformat() if request.started_at else None,
             "completed_at": request.completed_at.isoformat() if request.completed_at else None,
@@ -95,44 +165,43 @@ class JsonDownloadRequestRepository(DownloadRequestRepository):
             error_message=data.get("error_message"),
             retry_count=data.get("retry_count", 0),
             max_retries=data.get("max_retries", 3),
-            media_files=data.get("media_files", []),
-            metadata=data.get("metadata", {}),
+            media_files=data.get("media_files") or None,
+            metadata=data.get("metadata") or None,
             total_size=data.get("total_size"),
             processing_time=data.get("processing_time")
         )
     
     async def save(self, request: DownloadRequest) -> DownloadRequest:
         """Save download request"""
-        async with self._lock:
-            try:
-                data = await self._read_data()
+        try:
+            async with self._lock:
+                records = await self._get_records()
                 request_dict = self._request_to_dict(request)
                 
-                # Find existing request
-                for i, existing in enumerate(data):
-                    if existing["id"] == request.id:
-                        data[i] = request_dict
-                        break
-                else:
-                    # Request not found, add new
-                    data.append(request_dict)
-                
-                await self._write_data(data)
-                logger.debug(f"Saved download request {request.id}")
-                return request
+                existing = records.get(request.id)
+                if existing is not None:
+                    self._unindex(existing)
+                records[request.id] = request_dict
+                self._index(request_dict)
                 
-            except Exception as e:
-                logger.error(f"Error saving download request {request.id}: {e}")
-                raise RepositoryError(f"Failed to save download request: {e}")
+                # New and updated requests are both appended; the latest line wins on read.
+                # Queued under the lock so lines reach the file in the order changes were made
+                written = self._queue_append([request_dict])
+            
+            # Wait outside the lock so concurrent saves share one file write
+            await written
+            logger.debug(f"Saved download request {request.id}")
+            return request
+            
+        except Exception as e:
+            logger.error(f"Error saving download request {request.id}: {e}")
+            raise RepositoryError(f"Failed to save download request: {e}")
     
     async def get_by_id(self, request_id: str) -> Optional[DownloadRequest]:
         """Get download request by ID"""
         try:
-            data = await self._read_data()
-            for request_dict in data:
-                if request_dict["id"] == request_id:
-                    return self._dict_to_request(request_dict)
-            return None
+            request_dict = (await self._get_records()).get(request_id)
+            return self._dict_to_request(request_dict) if request_dict else None
         except Exception as e:
             logger.error(f"Error getting download request {request_id}: {e}")
             raise RepositoryError(f"Failed to get download request: {e}")
@@ -140,12 +209,11 @@ class JsonDownloadRequestRepository(DownloadRequestRepository):
     async def get_by_user_id(self, user_id: int, limit: int = 50) -> List[DownloadRequest]:
         """Get download requests for a user"""
         try:
-            data = await self._read_data()
-            user_requests = []
-            
-            for request_dict in data:
-                if request_dict["user_id"] == user_id:
-                    user_requests.append(self._dict_to_request(request_dict))
+            records = await self._get_records()
+            user_requests = [
+                self._dict_to_request(records[request_id])
+                for request_id in self._by_user.get(user_id, ())
+            ]
             
             # Sort by created_at descending and limit
             user_requests.sort(key=lambda x: x.created_at or datetime.min, reverse=True)
@@ -158,12 +226,10 @@ class JsonDownloadRequestRepository(DownloadRequestRepository):
     async def get_pending_requests(self) -> List[DownloadRequest]:
         """Get all pending download requests"""
         try:
-            data = await self._read_data()
-            pending_requests = []
-            
-            for request_dict in data:
-                if request_dict["status"] == DownloadStatus.PENDING.value:
-                    pending_requests.append(self._dict_to_request(request_dict))
+            pending_requests = [
+                self._dict_to_request(request_dict)
+                for request_dict in await self._get_by_status(DownloadStatus.PENDING.value)
+            ]
             
             # Sort by created_at ascending (oldest first)
             pending_requests.sort(key=lambda x: x.created_at or datetime.max)
@@ -177,14 +243,12 @@ class JsonDownloadRequestRepository(DownloadRequestRepository):
         """Get failed requests within specified hours"""
         try:
             cutoff_time = datetime.now() - timedelta(hours=hours)
-            data = await self._read_data()
             failed_requests = []
             
-            for request_dict in data:
-                if request_dict["status"] == DownloadStatus.FAILED.value:
-                    completed_at = datetime.fromisoformat(request_dict["completed_at"]) if request_dict.get("completed_at") else None
-                    if completed_at and completed_at >= cutoff_time:
-                        failed_requests.append(self._dict_to_request(request_dict))
+            for request_dict in await self._get_by_status(DownloadStatus.FAILED.value):
+                completed_at = datetime.fromisoformat(request_dict["completed_at"]) if request_dict.get("completed_at") else None
+                if completed_at and completed_at >= cutoff_time:
+                    failed_requests.append(self._dict_to_request(request_dict))
             
             return failed_requests
             
@@ -194,41 +258,43 @@ class JsonDownloadRequestRepository(DownloadRequestRepository):
     
     async def update_status(self, request_id: str, status: str, error_message: Optional[str] = None) -> bool:
         """Update request status"""
-        async with self._lock:
-            try:
-                data = await self._read_data()
-                
-                for request_dict in data:
-                    if request_dict["id"] == request_id:
-                        request_dict["status"] = status
-                        if error_message:
-                            request_dict["error_message"] = error_message
-                        if status in [DownloadStatus.COMPLETED.value, DownloadStatus.FAILED.value, DownloadStatus.CANCELLED.value]:
-                            request_dict["completed_at"] = datetime.now().isoformat()
-                        elif status == DownloadStatus.PROCESSING.value:
-                            request_dict["started_at"] = datetime.now().isoformat()
-                        
-                        await self._write_data(data)
-                        logger.debug(f"Updated status for request {request_id} to {status}")
-                        return True
+        try:
+            async with self._lock:
+                request_dict = (await self._get_records()).get(request_id)
+                if request_dict is None:
+                    return False
                 
-                return False
+                self._unindex(request_dict)
+                request_dict["status"] = status
+                self._index(request_dict)
+                if error_message:
+                    request_dict["error_message"] = error_message
+                if status in [DownloadStatus.COMPLETED.value, DownloadStatus.FAILED.value, DownloadStatus.CANCELLED.value]:
+                    request_dict["completed_at"] = datetime.now().isoformat()
+                elif status == DownloadStatus.PROCESSING.value:
+                    request_dict["started_at"] = datetime.now().isoformat()
                 
-            except Exception as e:
-                logger.error(f"Error updating status for request {request_id}: {e}")
-                raise RepositoryError(f"Failed to update request status: {e}")
+                written = self._queue_append([request_dict])
+            
+            await written
+            logger.debug(f"Updated status for request {request_id} to {status}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error updating status for request {request_id}: {e}")
+            raise RepositoryError(f"Failed to update request status: {e}")
     
     async def delete_old_requests(self, days: int = 7) -> int:
         """Delete old requests older than specified days"""
         async with self._lock:
             try:
                 cutoff_date = datetime.now() - timedelta(days=days)
-                data = await self._read_data()
-                original_count = len(data)
+                records = await self._get_records()
+                original_count = len(records)
                 
                 # Keep only requests newer than cutoff or still pending/processing
                 filtered_data = []
-                for request_dict in data:
+                for request_dict in records.values():
                     created_at = datetime.fromisoformat(request_dict["created_at"]) if request_dict.get("created_at") else datetime.now()
                     status = request_dict.get("status")
                     
@@ -238,7 +304,15 @@ class JsonDownloadRequestRepository(DownloadRequestRepository):
                 
                 deleted_count = original_count - len(filtered_data)
                 if deleted_count > 0:
+                    # Let queued appends finish so they don't interleave with the rewrite
+                    await self._wait_for_writes()
                     await self._write_data(filtered_data)
+                    
+                    self._by_user.clear()
+                    self._by_status.clear()
+                    for request_dict in filtered_data:
+                        self._index(request_dict)
+                    self._records = {request_dict["id"]: request_dict for request_dict in filtered_data}
                     logger.info(f"Deleted {deleted_count} old download requests")
                 
                 return deleted_count
@@ -252,10 +326,9 @@ class JsonDownloadRequestRepository(DownloadRequestRepository):
     ) -> List[DownloadRequest]:
         """Get requests within date range"""
         try:
-            data = await self._read_data()
             requests_in_range = []
             
-            for request_dict in data:
+            for request_dict in (await self._get_records()).values():
                 created_at = datetime.fromisoformat(request_dict["created_at"]) if request_dict.get("created_at") else datetime.now()
                 if start_date <= created_at <= end_date:
                     requests_in_range.append(self._dict_to_request(request_dict))
@@ -266,4 +339,21 @@ class JsonDownloadRequestRepository(DownloadRequestRepository):
             
         except Exception as e:
             logger.error(f"Error getting requests by date range: {e}")
-            raise RepositoryError(f"Failed to get requests by date range: {e}") 
\ No newline at end of file
+            raise RepositoryError(f"Failed to get requests by date range: {e}")
+    
+    async def count_pending_requests(self) -> int:
+        """Get pending request count"""
+        return await self._count_by_status(DownloadStatus.PENDING)
+    
+    async def count_processing_requests(self) -> int:
+        """Get processing request count"""
+        return await self._count_by_status(DownloadStatus.PROCESSING)
+    
+    async def _count_by_status(self, status: DownloadStatus) -> int:
+        """Count requests with the given status"""
+        try:
+            await self._get_records()
+            return len(self._by_status.get(status.value, ()))
+        except Exception as e:
+            logger.error(f"Error counting {status.value} requests: {e}")
+            raise RepositoryError(f"Failed to count {status.value} requests: {e}")
\ No newline at end of file
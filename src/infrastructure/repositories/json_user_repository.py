@@ -1,13 +1,16 @@
-import json
 import asyncio
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import logging
+import orjson
+from collections import Counter
+from itertools import islice
 
 from ...domain.entities.user import User
 from ...domain.repositories.user_repository import UserRepository
 from ...shared.exceptions import RepositoryError
+from ...shared.utils import atomic_write_bytes, DebouncedFlush
 
 logger = logging.getLogger(__name__)
 
@@ -15,10 +18,15 @@ logger = logging.getLogger(__name__)
 class JsonUserRepository(UserRepository):
     """JSON-based user repository implementation"""
     
-    def __init__(self, file_path: Path):
+    def __init__(self, file_path: Path, flush_delay: float = 0.5):
         self.file_path = Path(file_path)
         self._lock = asyncio.Lock()
+        self._load_lock = asyncio.Lock()
         self._ensure_file_exists()
+        
+        # Users are kept in memory keyed by ID and written back after flush_delay
+        self._users: Optional[Dict[int, Dict[str, Any]]] = None
+        self._flusher = DebouncedFlush(lambda: self._write_file(list(self._users.values())), flush_delay)
     
     def _ensure_file_exists(self):
         """Ensure the JSON file exists"""
@@ -30,37 +38,50 @@ class JsonUserRepository(UserRepository):
             logger.error(f"Failed to ensure file exists: {e}")
             raise RepositoryError(f"Failed to initialize user repository: {e}")
     
-    async def _read_data(self) -> List[Dict[str, Any]]:
+    async def _load_file(self) -> List[Dict[str, Any]]:
         """Read data from JSON file"""
         try:
-            loop = asyncio.get_event_loop()
-            content = await loop.run_in_executor(
-                None, 
-                lambda: self.file_path.read_text(encoding="utf-8")
-            )
-            return json.loads(content)
-        except json.JSONDecodeError as e:
+            # Parse the raw bytes directly, skipping the separate UTF-8 decode into a str
+            content = await asyncio.to_thread(self.file_path.read_bytes)
+            return orjson.loads(content)
+        except orjson.JSONDecodeError as e:
+            # Writes are atomic, so a corrupt file needs attention rather than being reset
             logger.error(f"Invalid JSON in user repository: {e}")
-            # Reset file if corrupted
-            await self._write_data([])
-            return []
+            raise RepositoryError(f"Failed to parse user data: {e}")
         except Exception as e:
             logger.error(f"Error reading user data: {e}")
             raise RepositoryError(f"Failed to read user data: {e}")
     
-    async def _write_data(self, data: List[Dict[str, Any]]):
-        """Write data to JSON file"""
+    async def _write_file(self, data: List[Dict[str, Any]]):
+        """Atomically write data to JSON file"""
         try:
-            loop = asyncio.get_event_loop()
-            content = json.dumps(data, indent=2, default=str, ensure_ascii=False)
-            await loop.run_in_executor(
-                None,
-                lambda: self.file_path.write_text(content, encoding="utf-8")
-            )
+            content = orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+            await asyncio.to_thread(atomic_write_bytes, self.file_path, content)
         except Exception as e:
             logger.error(f"Error writing user data: {e}")
             raise RepositoryError(f"Failed to write user data: {e}")
     
+    async def preload(self) -> None:
+        """Load users from file into memory"""
+        await self._get_users()
+        logger.info(f"Preloaded {len(self._users)} users")
+    
+    async def _get_users(self) -> Dict[int, Dict[str, Any]]:
+        """Get in-memory users by ID, loading them from file on first use"""
+        if self._users is None:
+            async with self._load_lock:
+                if self._users is None:
+                    self._users = {user_dict["id"]: user_dict for user_dict in await self._load_file()}
+        return self._users
+    
+    async def _read_data(self) -> List[Dict[str, Any]]:
+        """Get all user records from memory"""
+        return list((await self._get_users()).values())
+    
+    async def close(self) -> None:
+        """Write pending changes to file immediately"""
+        await self._flusher.close()
+    
     def _user_to_dict(self, user: User) -> Dict[str, Any]:
         """Convert User entity to dictionary"""
         return {
@@ -70,8 +91,8 @@ class JsonUserRepository(UserRepository):
             "last_name": user.last_name,
             "language": user.language,
             "is_premium": user.is_premium,
-            "created_at": user.created_at.isoformat() if user.created_at else None,
-            "last_active": user.last_active.isoformat() if user.last_active else None,
+            "created_at": user.created_at_iso,
+            "last_active": user.last_active_iso,
             "download_count": user.download_count,
             "is_banned": user.is_banned
         }
@@ -95,19 +116,9 @@ class JsonUserRepository(UserRepository):
         """Save or update a user"""
         async with self._lock:
             try:
-                data = await self._read_data()
-                user_dict = self._user_to_dict(user)
-                
-                # Find existing user
-                for i, existing in enumerate(data):
-                    if existing["id"] == user.id:
-                        data[i] = user_dict
-                        break
-                else:
-                    # User not found, add new
-                    data.append(user_dict)
-                
-                await self._write_data(data)
+                users = await self._get_users()
+                users[user.id] = self._user_to_dict(user)
+                self._flusher.schedule()
                 logger.debug(f"Saved user {user.id}")
                 return user
                 
@@ -118,15 +129,54 @@ class JsonUserRepository(UserRepository):
     async def get_by_id(self, user_id: int) -> Optional[User]:
         """Get user by ID"""
         try:
-            data = await self._read_data()
-            for user_dict in data:
-                if user_dict["id"] == user_id:
-                    return self._dict_to_user(user_dict)
-            return None
+            user_dict = (await self._get_users()).get(user_id)
+            return self._dict_to_user(user_dict) if user_dict else None
         except Exception as e:
             logger.error(f"Error getting user {user_id}: {e}")
             raise RepositoryError(f"Failed to get user: {e}")
     
+    async def upsert(self, user: User) -> Tuple[User, bool]:
+        """Insert user, or refresh profile fields of an existing one in one step"""
+        async with self._lock:
+            try:
+                users = await self._get_users()
+                user_dict = users.get(user.id)
+                if user_dict:
+                    user_dict["username"] = user.username
+                    user_dict["first_name"] = user.first_name
+                    user_dict["last_name"] = user.last_name
+                    user_dict["last_active"] = user.last_active_iso
+                    created = False
+                else:
+                    user_dict = self._user_to_dict(user)
+                    users[user.id] = user_dict
+                    created = True
+                
+                self._flusher.schedule()
+                logger.debug(f"Upserted user {user.id} (created={created})")
+                return self._dict_to_user(user_dict), created
+                
+            except Exception as e:
+                logger.error(f"Error upserting user {user.id}: {e}")
+                raise RepositoryError(f"Failed to upsert user: {e}")
+    
+    async def set_banned(self, user_id: int, banned: bool) -> Optional[User]:
+        """Set user's banned status in one step, returning updated user or None if not found"""
+        async with self._lock:
+            try:
+                user_dict = (await self._get_users()).get(user_id)
+                if not user_dict:
+                    return None
+                
+                user_dict["is_banned"] = banned
+                self._flusher.schedule()
+                logger.debug(f"Set banned={banned} for user {user_id}")
+                return self._dict_to_user(user_dict)
+                
+            except Exception as e:
+                logger.error(f"Error setting banned status for user {user_id}: {e}")
+                raise RepositoryError(f"Failed to set banned status: {e}")
+    
     async def get_all(self) -> List[User]:
         """Get all users"""
         try:
@@ -136,19 +186,27 @@ class JsonUserRepository(UserRepository):
             logger.error(f"Error getting all users: {e}")
             raise RepositoryError(f"Failed to get all users: {e}")
     
+    async def get_paginated(self, offset: int, limit: int) -> List[User]:
+        """Get a page of users"""
+        try:
+            # Walk the dict in place instead of copying every user to slice one page
+            users = (await self._get_users()).values()
+            return [self._dict_to_user(user_dict) for user_dict in islice(users, offset, offset + limit)]
+        except Exception as e:
+            logger.error(f"Error getting users page (offset={offset}, limit={limit}): {e}")
+            raise RepositoryError(f"Failed to get users page: {e}")
+    
     async def delete(self, user_id: int) -> bool:
         """Delete user by ID"""
         async with self._lock:
             try:
-                data = await self._read_data()
-                original_length = len(data)
-                data = [user for user in data if user["id"] != user_id]
+                users = await self._get_users()
+                if users.pop(user_id, None) is None:
+                    return False
                 
-                if len(data) < original_length:
-                    await self._write_data(data)
-                    logger.debug(f"Deleted user {user_id}")
-                    return True
-                return False
+                self._flusher.schedule()
+                logger.debug(f"Deleted user {user_id}")
+                return True
                 
             except Exception as e:
                 logger.error(f"Error deleting user {user_id}: {e}")
@@ -156,8 +214,7 @@ class JsonUserRepository(UserRepository):
     
     async def exists(self, user_id: int) -> bool:
         """Check if user exists"""
-        user = await self.get_by_id(user_id)
-        return user is not None
+        return user_id in await self._get_users()
     
     async def get_active_users(self, days: int = 30) -> List[User]:
         """Get users active within specified days"""
@@ -192,11 +249,56 @@ class JsonUserRepository(UserRepository):
             logger.error(f"Error getting banned users: {e}")
             raise RepositoryError(f"Failed to get banned users: {e}")
     
+    async def get_broadcast_recipients(self, language: Optional[str] = None) -> List[int]:
+        """Get IDs of users that are not banned, optionally filtered by language"""
+        try:
+            data = await self._read_data()
+            return [
+                user_dict["id"]
+                for user_dict in data
+                if not user_dict.get("is_banned", False)
+                and (language is None or user_dict.get("language", "en") == language)
+            ]
+        except Exception as e:
+            logger.error(f"Error getting broadcast recipients: {e}")
+            raise RepositoryError(f"Failed to get broadcast recipients: {e}")
+    
     async def count_total_users(self) -> int:
         """Get total user count"""
         try:
-            data = await self._read_data()
-            return len(data)
+            return len(await self._get_users())
         except Exception as e:
             logger.error(f"Error counting users: {e}")
-            raise RepositoryError(f"Failed to count users: {e}") 
\ No newline at end of file
+            raise RepositoryError(f"Failed to count users: {e}")
+    
+    async def count_active_users(self, days: int = 30) -> int:
+        """Get count of users active within specified days"""
+        try:
+            cutoff_date = datetime.now() - timedelta(days=days)
+            data = await self._read_data()
+            return sum(
+                1 for user_dict in data
+                if user_dict.get("last_active")
+                and datetime.fromisoformat(user_dict["last_active"]) >= cutoff_date
+            )
+        except Exception as e:
+            logger.error(f"Error counting active users: {e}")
+            raise RepositoryError(f"Failed to count active users: {e}")
+    
+    async def count_banned_users(self) -> int:
+        """Get banned user count"""
+        try:
+            data = await self._read_data()
+            return sum(1 for user_dict in data if user_dict.get("is_banned", False))
+        except Exception as e:
+            logger.error(f"Error counting banned users: {e}")
+            raise RepositoryError(f"Failed to count banned users: {e}")
+    
+    async def get_language_breakdown(self) -> Dict[str, int]:
+        """Get user count per language"""
+        try:
+            data = await self._read_data()
+            return dict(Counter(user_dict.get("language", "en") for user_dict in data))
+        except Exception as e:
+            logger.error(f"Error getting language breakdown: {e}")
+            raise RepositoryError(f"Failed to get language breakdown: {e}")
\ No newline at end of file
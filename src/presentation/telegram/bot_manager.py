@@ -251,6 +251,9 @@ class BotManager:
                 await self.application.shutdown()
                 logger.info("Main bot stopped")
             
+            # Flush buffered analytics
+            await self.container.shutdown()
+            
             logger.info("Bot manager stopped successfully")
             
         except Exception as e:
@@ -12,6 +12,10 @@ class Constants:
     PLATFORM_INSTAGRAM = "instagram"
     PLATFORM_TIKTOK = "tiktok"
     SUPPORTED_PLATFORMS = [PLATFORM_INSTAGRAM, PLATFORM_TIKTOK]
+    PLATFORM_HOSTS = {
+        PLATFORM_INSTAGRAM: ["instagram.com", "www.instagram.com", "instagr.am", "www.instagr.am"],
+        PLATFORM_TIKTOK: ["tiktok.com", "www.tiktok.com", "vm.tiktok.com", "vt.tiktok.com", "m.tiktok.com"]
+    }
     
     # Rate Limiting Actions
     ACTION_DOWNLOAD = "download"
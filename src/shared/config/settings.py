@@ -30,8 +30,11 @@ class Settings:
     
     # Performance Settings
     MAX_FILE_SIZE: int = int(os.getenv("MAX_FILE_SIZE", "50"))
+    MAX_FILE_SIZE_BYTES: int = MAX_FILE_SIZE * 1024 * 1024
     MAX_CONCURRENT_DOWNLOADS: int = int(os.getenv("MAX_CONCURRENT_DOWNLOADS", "2" if IS_AZURE else "3"))
     CACHE_DURATION: int = int(os.getenv("CACHE_DURATION", "3600"))
+    ANALYTICS_BATCH_SIZE: int = int(os.getenv("ANALYTICS_BATCH_SIZE", "100"))
+    ANALYTICS_FLUSH_INTERVAL: float = float(os.getenv("ANALYTICS_FLUSH_INTERVAL", "5"))
     
     # Rate Limiting
     RATE_LIMIT_REQUESTS: int = int(os.getenv("RATE_LIMIT_REQUESTS", "10"))
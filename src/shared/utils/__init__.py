@@ -0,0 +1,12 @@
+from .file_utils import atomic_write_bytes
+from .debounced_flush import DebouncedFlush
+from .json_lines import to_json_lines, read_json_lines, append_json_lines, prepare_json_lines_file
+
+__all__ = [
+    'atomic_write_bytes',
+    'DebouncedFlush',
+    'to_json_lines',
+    'read_json_lines',
+    'append_json_lines',
+    'prepare_json_lines_file'
+]
\ No newline at end of file
@@ -0,0 +1,60 @@
+import asyncio
+from typing import Awaitable, Callable, Optional
+
+
+class DebouncedFlush:
+    """
+    Coalesce changes to in-memory data into one write, flush_delay seconds after the first change
+    
+    write should log and raise on failure; the changes then stay pending until
+    the next change or close().
+    """
+    
+    def __init__(self, write: Callable[[], Awaitable[None]], flush_delay: float):
+        self._write = write
+        self._flush_delay = flush_delay
+        self._task: Optional[asyncio.Task] = None
+        self._flush_now = asyncio.Event()
+        self._dirty = False
+    
+    def schedule(self) -> None:
+        """Mark data as changed and schedule a write if none is pending"""
+        self._dirty = True
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_later())
+    
+    async def _flush_later(self) -> None:
+        """Wait for more changes to accumulate, then write them in one go"""
+        while self._dirty:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), self._flush_delay)
+            except asyncio.TimeoutError:
+                pass
+            
+            try:
+                await self._flush()
+            except Exception:
+                # Already logged by write; keep the changes pending for the next change or close()
+                break
+    
+    async def _flush(self) -> None:
+        """Write pending changes, marking them pending again if the write fails"""
+        self._dirty = False
+        try:
+            await self._write()
+        except Exception:
+            self._dirty = True
+            raise
+    
+    async def close(self) -> None:
+        """Write pending changes immediately"""
+        if self._task is not None and not self._task.done():
+            self._flush_now.set()
+            try:
+                await self._task
+            finally:
+                self._flush_now.clear()
+        
+        if self._dirty:
+            # The last scheduled write failed; try once more before shutting down
+            await self._flush()
\ No newline at end of file
@@ -0,0 +1,17 @@
+import os
+from pathlib import Path
+
+
+def atomic_write_bytes(path: Path, content: bytes) -> None:
+    """
+    Replace file contents so a crash leaves either the old or the new file
+    
+    Content goes to a temporary file next to the target, is flushed to disk,
+    then renamed over the target.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
\ No newline at end of file
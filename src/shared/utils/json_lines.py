@@ -0,0 +1,83 @@
+import logging
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+import orjson
+
+from .file_utils import atomic_write_bytes
+
+logger = logging.getLogger(__name__)
+
+
+def to_json_lines(records: List[Dict[str, Any]]) -> bytes:
+    """Serialize records as JSON lines"""
+    return b"".join(
+        orjson.dumps(record, default=str, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        for record in records
+    )
+
+
+def read_json_lines(path: Path, key: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Read records from a JSON lines file
+    
+    With key, records are updated by appending them again, so only the
+    last line for each key value is kept.
+    """
+    records: List[Dict[str, Any]] = []
+    latest: Dict[Any, Dict[str, Any]] = {}
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                # Skip a line torn by a crash mid-append instead of dropping the whole log
+                logger.warning(f"Skipping invalid record in {path.name}: {e}")
+                continue
+            if key is None:
+                records.append(record)
+            else:
+                latest[record[key]] = record
+    return records if key is None else list(latest.values())
+
+
+def append_json_lines(path: Path, content: bytes) -> None:
+    """Append serialized JSON lines to a file"""
+    with open(path, "ab") as f:
+        f.write(content)
+
+
+def prepare_json_lines_file(path: Path, key: Optional[str] = None) -> None:
+    """
+    Ensure a JSON lines file exists and is ready for appending
+    
+    A legacy JSON array file is converted and a record torn by a crash
+    mid-append is cut off. With key, lines superseded by later updates
+    are compacted away.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if not path.exists():
+        path.touch()
+        return
+    
+    content = path.read_bytes()
+    if content.lstrip().startswith(b"["):
+        # An unreadable legacy file raises instead of being replaced, so no data is lost
+        data = orjson.loads(content)
+        atomic_write_bytes(path, to_json_lines(data))
+        logger.info(f"Converted {len(data)} records in {path.name} to JSON lines")
+        return
+    
+    if content and not content.endswith(b"\n"):
+        # Cut a record torn by a crash mid-append so the next append starts on its own line
+        content = content[:content.rfind(b"\n") + 1]
+        atomic_write_bytes(path, content)
+        logger.warning(f"Dropped a partially written record in {path.name}")
+    
+    if key is not None:
+        # Drop superseded lines left by appended updates
+        data = read_json_lines(path, key)
+        if len(data) < content.count(b"\n"):
+            atomic_write_bytes(path, to_json_lines(data))
\ No newline at end of file